@@ -0,0 +1,111 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from supabase_setup import init_supabase
+
+# Everything a page needs about a user; the password never leaves the query.
+PUBLIC_COLUMNS = "username, role, division, divisions, subjects"
+
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))
+SESSION_TTL = float(os.getenv("SESSION_TTL_HOURS", "12")) * 3600
+# The token lives in a cookie, never in the URL, where browser history, a
+# shared link or a screenshot would hand the account over.
+SESSION_COOKIE = "class_tracker_session"
+
+# Cached credentials are kept only as a keyed digest, with a key that lives
+# and dies with this process.
+_digest_key = secrets.token_bytes(32)
+_directory = {}
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _digest(password):
+    return hmac.new(_digest_key, (password or "").encode("utf-8"), hashlib.sha256).digest()
+
+
+# ---------------------- User Directory ----------------------
+def _lookup(username, password):
+    rows = init_supabase().table("users").select(PUBLIC_COLUMNS) \
+        .eq("username", username).eq("password", password).limit(1).execute().data
+    return rows[0] if rows else None
+
+
+def authenticate(username, password):
+    now = time.monotonic()
+    with _lock:
+        cached = _directory.get(username)
+    if cached and now - cached["loaded_at"] < USER_CACHE_TTL and hmac.compare_digest(cached["digest"], _digest(password)):
+        return dict(cached["user"])
+
+    # Cache miss, expiry or a different password (it may have just changed)
+    user = _lookup(username, password)
+    if user:
+        with _lock:
+            _directory[username] = {"user": user, "digest": _digest(password), "loaded_at": now}
+        return dict(user)
+    return None
+
+
+def invalidate_users(username=None):
+    # Called by the admin panel after editing users; also ends the affected
+    # sessions so changed roles or subjects take effect on the next visit.
+    with _lock:
+        if username is None:
+            _directory.clear()
+            _sessions.clear()
+            return
+        _directory.pop(username, None)
+        for token in [t for t, s in _sessions.items() if s["user"]["username"] == username]:
+            del _sessions[token]
+
+
+# ---------------------- Session Tokens ----------------------
+def issue_token(user):
+    token = secrets.token_urlsafe(24)
+    now = time.monotonic()
+    with _lock:
+        # Expired tokens that are never resumed would otherwise stay for the
+        # life of the process; each login clears them out.
+        for expired in [t for t, s in _sessions.items() if s["expires"] <= now]:
+            del _sessions[expired]
+        _sessions[token] = {"user": dict(user), "expires": now + SESSION_TTL}
+    return token
+
+
+def resume_session(token):
+    with _lock:
+        session = _sessions.get(token)
+        if session and session["expires"] > time.monotonic():
+            return dict(session["user"])
+        _sessions.pop(token, None)
+    return None
+
+
+def revoke_token(token):
+    with _lock:
+        _sessions.pop(token, None)
+
+
+def session_cookie_script(token, secure=False):
+    # Sets the session cookie from the page (Streamlit has no response to
+    # attach a Set-Cookie header to); token=None clears it. SameSite=Strict
+    # keeps other sites from sending it along with their requests.
+    value, max_age = (token, int(SESSION_TTL)) if token else ("", 0)
+    flags = "; Secure" if secure else ""
+    return (f"<script>document.cookie = '{SESSION_COOKIE}={value}; Max-Age={max_age}; "
+            f"Path=/; SameSite=Strict{flags}';</script>")
+
+
+def restore_session(state, cookies):
+    # A browser refresh starts a new Streamlit session; the session cookie
+    # brings the user back without touching the database.
+    token = cookies.get(SESSION_COOKIE)
+    if state.get("user") is None and token:
+        state["user"] = resume_session(token)
+        if state["user"]:
+            state["session_token"] = token
+    return state.get("user")
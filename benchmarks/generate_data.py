@@ -0,0 +1,260 @@
+import argparse
+import datetime
+import itertools
+import json
+import os
+import random
+import string
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from time_slots import parse_slot  # noqa: E402
+
+WEEK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# Six one-hour periods; a lab takes two neighbouring periods.
+LECTURE_SLOTS = ["10:30-11:30", "11:30-12:30", "1:00-2:00", "2:00-3:00", "3:15-4:15", "4:15-5:15"]
+LAB_SLOTS = ["10:30-12:30", "1:00-3:00", "3:15-5:15"]
+SATURDAY_PERIODS = 3
+
+SUBJECTS = ["AI", "CD", "CC", "DF", "IS", "ML", "DBMS", "OS", "CN", "SE", "TOC", "DAA", "WT", "IoT", "BDA", "CV"]
+
+# Status and response mixes seen in a typical semester
+FACULTY_MARK_RATE = 0.85
+FACULTY_STATUSES = [("Class Happened", 0.80), ("Cancelled", 0.12), ("No Students Present", 0.08)]
+STATUS_MESSAGES = {
+    "Class Happened": "Class was held successfully.",
+    "Cancelled": "Class was cancelled.",
+    "No Students Present": "No students attended the lecture.",
+}
+STUDENT_REPORT_RATE = 0.30      # of unmarked slots
+FALSE_REPORT_RATE = 0.02        # of slots the faculty marked as held
+FACULTY_RESPONSE_RATE = 0.60
+RESPONSES = ["I'm coming", "I'm unavailable", "Contact Class Coordinator", "Shifted to the next slot"]
+
+
+def _faculty_codes(count, rng):
+    codes = ["".join(c) for c in itertools.product(string.ascii_uppercase, repeat=3)]
+    return sorted(rng.sample(codes, count))
+
+
+# ---------------------- Timetable & Users ----------------------
+def generate_timetable(divisions, batches, faculty, subjects_per_division, rng):
+    division_names = [string.ascii_uppercase[i] for i in range(divisions)]
+    subjects = SUBJECTS[:max(subjects_per_division, 1)]
+
+    # Every (division, subject) gets a teacher; teachers carry a few each.
+    teaches = {}
+    pairs = [(d, s) for d in division_names for s in subjects]
+    rng.shuffle(pairs)
+    for i, pair in enumerate(pairs):
+        teaches[pair] = faculty[i % len(faculty)]
+
+    busy = set()          # (day, period, faculty) and (day, period, room)
+    timetable = []
+
+    def free(day, periods, teacher, room):
+        return all((day, p, teacher) not in busy and (day, p, room) not in busy for p in periods)
+
+    def book(day, periods, teacher, room):
+        for p in periods:
+            busy.add((day, p, teacher))
+            busy.add((day, p, room))
+
+    for day in WEEK_DAYS:
+        periods = SATURDAY_PERIODS if day == "Saturday" else len(LECTURE_SLOTS)
+        for division in division_names:
+            classroom = f"{200 + division_names.index(division)}"
+            lab_block = rng.randrange(periods // 2) if day != "Saturday" else None
+            for period in range(periods):
+                if lab_block is not None and period // 2 == lab_block:
+                    if period % 2:
+                        continue
+                    # One lab per batch, each with its own subject, teacher and lab room
+                    for b in range(batches):
+                        for subject in rng.sample(subjects, len(subjects)):
+                            teacher = teaches[(division, subject)]
+                            room = f"Lab-{rng.randrange(1, batches * divisions + 1)}"
+                            if free(day, (period, period + 1), teacher, room):
+                                book(day, (period, period + 1), teacher, room)
+                                timetable.append({
+                                    "day": day, "time": LAB_SLOTS[lab_block], "subject": subject,
+                                    "faculty": teacher, "division": division, "batch": f"{division}{b + 1}",
+                                    "room": room, "type": "Lab",
+                                })
+                                break
+                    continue
+                for subject in rng.sample(subjects, len(subjects)):
+                    teacher = teaches[(division, subject)]
+                    if free(day, (period,), teacher, classroom):
+                        book(day, (period,), teacher, classroom)
+                        timetable.append({
+                            "day": day, "time": LECTURE_SLOTS[period], "subject": subject,
+                            "faculty": teacher, "division": division, "room": classroom, "type": "Lecture",
+                        })
+                        break
+    return timetable, teaches
+
+
+def generate_users(faculty, teaches, divisions, students_per_division):
+    users = [{"username": "admin@ldce.ac.in", "password": "admin123", "role": "admin"}]
+    for i, teacher in enumerate(faculty):
+        mine = [pair for pair, t in teaches.items() if t == teacher]
+        users.append({
+            "username": teacher,
+            "password": f"faculty{i:03d}",
+            "role": "faculty",
+            "subjects": sorted({s for _, s in mine}),
+            "divisions": sorted({d for d, _ in mine}),
+        })
+    for d in range(divisions):
+        division = string.ascii_uppercase[d]
+        for n in range(students_per_division):
+            users.append({
+                "username": f"student.{division.lower()}{n:03d}@ldce.ac.in",
+                "password": f"student{n:03d}",
+                "role": "student",
+                "division": division,
+                "subjects": ["All"],
+            })
+    return users
+
+
+# ---------------------- Notifications ----------------------
+def _pick(mix, rng):
+    roll = rng.random()
+    for value, share in mix:
+        if roll < share:
+            return value
+        roll -= share
+    return mix[-1][0]
+
+
+def _ended(date, time_slot):
+    end = parse_slot(time_slot).end
+    return datetime.datetime.combine(date, datetime.time(end // 60, end % 60))
+
+
+def _stamps(date, time_slot, rng, now):
+    # Shortly after the slot ends, never later than now. timestamp is local
+    # time as the pages write it; updated_at is an aware UTC stamp, as
+    # change_feed.now_stamp() writes it.
+    ended = _ended(date, time_slot)
+    minutes = min(90, int((now - ended).total_seconds() // 60) + 1)
+    moment = ended + datetime.timedelta(minutes=rng.randrange(0, minutes))
+    return moment.strftime("%Y-%m-%d %H:%M:%S"), moment.astimezone(datetime.timezone.utc).isoformat()
+
+
+def generate_notifications(timetable, users, start, end, rng, now=None):
+    # now: nothing is generated for classes that haven't ended by then, so
+    # "today" pages see the same picture as a live deployment.
+    now = now or datetime.datetime.now()
+    students = {}
+    for user in users:
+        if user["role"] == "student":
+            students.setdefault(user["division"], []).append(user["username"])
+    by_day = {}
+    for entry in timetable:
+        by_day.setdefault(entry["day"], []).append(entry)
+
+    notes = []
+    date = start
+    while date <= end:
+        day = date.strftime("%A")
+        for entry in by_day.get(day, []):
+            if _ended(date, entry["time"]) > now:
+                continue
+            base = {
+                "subject": entry["subject"], "division": entry["division"], "day": day,
+                "date": date.isoformat(), "time": entry["time"], "faculty": entry["faculty"],
+            }
+            marked = rng.random() < FACULTY_MARK_RATE
+            status = _pick(FACULTY_STATUSES, rng) if marked else None
+            if marked:
+                stamp, updated = _stamps(date, entry["time"], rng, now)
+                notes.append({
+                    **base, "username": entry["faculty"], "role": "faculty", "type": entry.get("type", ""),
+                    "status": status, "message": STATUS_MESSAGES[status], "timestamp": stamp, "updated_at": updated,
+                })
+
+            report_rate = STUDENT_REPORT_RATE if not marked else FALSE_REPORT_RATE if status == "Class Happened" else 0
+            if students.get(entry["division"]) and rng.random() < report_rate:
+                stamp, updated = _stamps(date, entry["time"], rng, now)
+                response = None
+                if rng.random() < FACULTY_RESPONSE_RATE:
+                    response = {"by": entry["faculty"], "message": rng.choice(RESPONSES)}
+                notes.append({
+                    **base, "username": rng.choice(students[entry["division"]]), "role": "student",
+                    "status": "Faculty not present", "message": "Reported faculty absence",
+                    "response": response, "timestamp": stamp, "updated_at": updated,
+                })
+        date += datetime.timedelta(days=1)
+    return notes
+
+
+def generate_college(divisions=8, batches=3, faculty=60, subjects_per_division=8, students_per_division=60,
+                     months=5, end_date=None, seed=42):
+    rng = random.Random(seed)
+    end = end_date or datetime.date.today()
+    start = end - datetime.timedelta(days=round(months * 30.4))
+    faculty_names = [f"{code}@ldce.ac.in" for code in _faculty_codes(faculty, rng)]
+    timetable, teaches = generate_timetable(divisions, batches, faculty_names, subjects_per_division, rng)
+    users = generate_users(faculty_names, teaches, divisions, students_per_division)
+    now = min(datetime.datetime.now(), datetime.datetime.combine(end, datetime.time.max))
+    notifications = generate_notifications(timetable, users, start, end, rng, now)
+    return {"timetable": timetable, "users": users, "notifications": notifications}
+
+
+# ---------------------- Writers ----------------------
+def write_sqlite(path, data, chunk_size=1000):
+    # Builds a fresh SQLite database for DB_BACKEND=sqlite, including the
+    # monthly report rollup, so pages see what a live deployment would.
+    os.environ["DB_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = path
+    from bulk_sync import chunked
+    from sqlite_backend import create_sqlite_client
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    client = create_sqlite_client(path)
+    for table in ("timetable", "users", "notifications"):
+        for chunk in chunked(data[table], chunk_size):
+            client.table(table).insert(chunk).execute()
+    client.conn.close()
+
+    from rollup_store import rebuild_rollup
+    return rebuild_rollup()
+
+
+def write_json(directory, data):
+    os.makedirs(directory, exist_ok=True)
+    for table in ("timetable", "users"):
+        with open(os.path.join(directory, f"{table}.json"), "w", encoding="utf-8") as f:
+            json.dump(data[table], f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic college (timetable, users, notifications).")
+    parser.add_argument("--divisions", type=int, default=8)
+    parser.add_argument("--batches", type=int, default=3, help="Lab batches per division.")
+    parser.add_argument("--faculty", type=int, default=60)
+    parser.add_argument("--subjects", type=int, default=8, help="Subjects per division.")
+    parser.add_argument("--students", type=int, default=60, help="Students per division.")
+    parser.add_argument("--months", type=float, default=5, help="Months of notification history up to today.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.db"),
+                        help="SQLite database to (re)create.")
+    parser.add_argument("--json-dir", help="Also write timetable.json and users.json here, for upload_*.py.")
+    args = parser.parse_args()
+
+    data = generate_college(args.divisions, args.batches, args.faculty, args.subjects, args.students,
+                            args.months, seed=args.seed)
+    if args.json_dir:
+        write_json(args.json_dir, data)
+    rollup = write_sqlite(args.db, data)
+
+    print(f"\nGenerated into {args.db}:")
+    for table in ("timetable", "users", "notifications"):
+        print(f"  {table:<14}: {len(data[table])}")
+    print(f"  rollup rows   : {rollup['rollup_rows']}")
@@ -0,0 +1,260 @@
+import argparse
+import datetime
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+parser = argparse.ArgumentParser(description="Simulate concurrent sessions right after a lecture ends.")
+parser.add_argument("--db", default=os.path.join(BENCH_DIR, "bench.db"), help="SQLite database (generated if missing).")
+parser.add_argument("--sessions", type=int, default=20, help="Concurrent sessions.")
+parser.add_argument("--journeys", type=int, default=3, help="Journeys per session.")
+parser.add_argument("--faculty-share", type=float, default=0.5, help="Share of sessions that are faculty.")
+parser.add_argument("--think-ms", type=float, default=0, help="Pause between actions, like a user reading the page.")
+parser.add_argument("--seed", type=int, default=7)
+args = parser.parse_args()
+
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = args.db
+if not os.path.exists(args.db):
+    from generate_data import generate_college, write_sqlite
+    print(f"Generating benchmark data into {args.db} ...")
+    write_sqlite(args.db, generate_college())
+
+import streamlit
+from unittest.mock import MagicMock
+from streamlit.components.v2.component_manager import BidiComponentManager
+from streamlit.logger import set_log_level
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.testing.v1 import AppTest, app_test
+from supabase_setup import init_supabase
+
+set_log_level("error")
+
+# share_runtime() patches Streamlit internals (Runtime, ScriptCache and
+# AppTest's PagesManager) as they are in this release; benchmarks/requirements.txt
+# pins it. Other versions may run, but harness failures are then likely.
+HARNESS_STREAMLIT = "1.65.0"
+
+
+def share_runtime():
+    # AppTest installs a fresh mock Runtime and script cache for each run and
+    # removes the runtime when the run ends, which breaks runs on other
+    # threads. It also resets the pages-directory flag before every run, so
+    # another session can briefly see it unset and compute different widget
+    # ids, and compiling the same page concurrently trips CPython's parser.
+    # A real server has one runtime, one st.cache_data store, one pages
+    # layout and one compiled copy of each page for all sessions, so the
+    # harness does too.
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    compile_page = ScriptCache.get_bytecode
+    compiled = {}
+    compile_lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = compile_page(self, script_path)
+            return compiled[script_path]
+    ScriptCache.get_bytecode = get_bytecode
+
+    class PinnedLayout(type):
+        def __setattr__(cls, name, value):
+            if not (name == "uses_pages_directory" and value is None):
+                super().__setattr__(name, value)
+
+    app_test.PagesManager = PinnedLayout("PagesManager", (PagesManager,), {})
+
+
+if streamlit.__version__ != HARNESS_STREAMLIT:
+    print(f"Warning: the harness was written against Streamlit {HARNESS_STREAMLIT}, "
+          f"this is {streamlit.__version__} (pip install -r benchmarks/requirements.txt).")
+share_runtime()
+
+TODAY = datetime.datetime.now().strftime("%A")
+
+
+class JourneyError(Exception):
+    # Raised for what the app did wrong: a page exception, a rejected login,
+    # a missing button. Anything else raised while driving AppTest is a
+    # harness failure and is not counted against the app.
+    pass
+
+
+# ---------------------- Recorder ----------------------
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}     # action -> [(ms, ok)]
+        self.errors = {}      # action -> {message: count}
+        self.harness = {}     # action -> {message: count}
+
+    def record(self, action, ms, error=None, harness=None):
+        with self.lock:
+            if harness is not None:
+                # No sample: the timing of a run the harness broke says
+                # nothing about the app.
+                counts = self.harness.setdefault(action, {})
+                counts[harness] = counts.get(harness, 0) + 1
+                return
+            self.samples.setdefault(action, []).append((ms, error is None))
+            if error is not None:
+                counts = self.errors.setdefault(action, {})
+                counts[error] = counts.get(error, 0) + 1
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# ---------------------- Journeys ----------------------
+# Each step drives the real page scripts through AppTest, so timings include
+# render_timetable, the change feeds and the report code, not just queries.
+class Session:
+    def __init__(self, user, results):
+        self.user = user
+        self.results = results
+        self.app = None
+
+    def step(self, action, run):
+        start = time.perf_counter()
+        error = harness = None
+        try:
+            run()
+            if self.app is not None and self.app.exception:
+                raise JourneyError(self.app.exception[0].value.splitlines()[0])
+        except JourneyError as e:
+            error = f"{type(e).__name__}: {e}"[:160]
+        except Exception as e:
+            # Page exceptions are caught by the script runner and surface as
+            # app.exception above, so this came from AppTest itself.
+            harness = f"{type(e).__name__}: {e}"[:160]
+        self.results.record(action, (time.perf_counter() - start) * 1000, error, harness)
+        if args.think_ms:
+            time.sleep(args.think_ms / 1000)
+        return error is None and harness is None
+
+    def login(self):
+        def run():
+            self.app = AppTest.from_file(os.path.join(ROOT, "main.py"), default_timeout=120).run()
+            self.app.text_input[0].input(self.user["username"])
+            self.app.text_input[1].input(self.user["password"])
+            self.app.button[0].click().run()
+            if not self.app.session_state["user"]:
+                raise JourneyError("login rejected: " + "; ".join(e.value for e in self.app.error))
+        return self.step("login", run)
+
+    def open_page(self, action, page):
+        return self.step(action, lambda: self.app.switch_page(page).run())
+
+    def click(self, action, prefix):
+        def run():
+            buttons = [b for b in self.app.button if b.key and b.key.startswith(prefix)]
+            if not buttons:
+                raise JourneyError(f"no '{prefix}' button on the page")
+            buttons[0].click().run()
+        return self.step(action, run)
+
+    def faculty_journey(self):
+        if not self.login():
+            return
+        if not self.open_page("today_view", "pages/1_timetable_view.py"):
+            return
+        # Post then undo leaves the data as it was; a slot that is already
+        # marked is undone first and marked again.
+        if any(b.key and b.key.startswith("happened_") for b in self.app.button):
+            self.click("post_notification", "happened_") and self.click("undo", "undo_")
+        else:
+            self.click("undo", "undo_") and self.click("post_notification", "happened_")
+        self.open_page("monthly_report", "pages/4_monthly_report.py")
+
+    def student_journey(self):
+        if not self.login():
+            return
+        if not self.open_page("today_view", "pages/1_timetable_view.py"):
+            return
+        self.open_page("student_reports", "pages/3_notification_history_student.py")
+
+
+def pick_users(count, rng):
+    client = init_supabase()
+    teaching = {row["faculty"] for row in client.table("timetable").select("faculty").eq("day", TODAY).execute().data}
+    faculty = [u for u in client.table("users").select("username, password").eq("role", "faculty").execute().data
+               if u["username"] in teaching]
+    students = client.table("users").select("username, password").eq("role", "student").execute().data
+    if not faculty:
+        print(f"Nobody teaches on {TODAY}; faculty sessions will only log in and read.")
+        faculty = client.table("users").select("username, password").eq("role", "faculty").execute().data
+
+    n_faculty = round(count * args.faculty_share)
+    chosen = [("faculty", u) for u in rng.sample(faculty, min(n_faculty, len(faculty)))]
+    chosen += [("student", u) for u in rng.sample(students, min(count - len(chosen), len(students)))]
+    return chosen
+
+
+def run_session(role, user, results):
+    session = Session(user, results)
+    for _ in range(args.journeys):
+        if role == "faculty":
+            session.faculty_journey()
+        else:
+            session.student_journey()
+
+
+# ---------------------- Run ----------------------
+rng = random.Random(args.seed)
+results = Results()
+sessions = pick_users(args.sessions, rng)
+
+print(f"\nRunning {len(sessions)} concurrent sessions x {args.journeys} journeys ({TODAY}) ...")
+started = time.perf_counter()
+with ThreadPoolExecutor(max_workers=len(sessions)) as pool:
+    for future in [pool.submit(run_session, role, user, results) for role, user in sessions]:
+        future.result()
+elapsed = time.perf_counter() - started
+
+total = sum(len(s) for s in results.samples.values())
+print(f"\n{'action':<20} {'count':>6} {'per s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+for action, samples in results.samples.items():
+    ms = [m for m, _ in samples]
+    failed = sum(1 for _, ok in samples if not ok)
+    print(f"{action:<20} {len(samples):>6} {len(samples) / elapsed:>7.1f} {percentile(ms, 50):>8.0f} "
+          f"{percentile(ms, 95):>8.0f} {percentile(ms, 99):>8.0f} {failed / len(samples):>6.1%}")
+print(f"\n{total} actions in {elapsed:.1f}s ({total / elapsed:.1f} actions/s)")
+
+if results.harness:
+    print("\nHarness failures (not counted as app errors; the rest of that journey was skipped):")
+    for action, counts in results.harness.items():
+        for message, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {action}: {count} x {message}")
+
+if results.errors:
+    print("\nErrors:")
+    for action, counts in results.errors.items():
+        for message, count in sorted(counts.items(), key=lambda item: -item[1]):
+            print(f"  {action}: {count} x {message}")
+    exit(1)
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Benchmarks run against the local SQLite backend unless told otherwise.
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench.db"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from supabase_setup import init_supabase
+import auth
+
+parser = argparse.ArgumentParser(description="Measure login throughput for the old and new login paths.")
+parser.add_argument("--logins", type=int, default=2000, help="Login attempts per path.")
+parser.add_argument("--threads", type=int, default=8, help="Concurrent login workers.")
+args = parser.parse_args()
+
+supabase = init_supabase()
+users = supabase.table("users").select("username, password").execute().data
+if not users:
+    print("No users to log in with.")
+    exit(1)
+attempts = [users[i % len(users)] for i in range(args.logins)]
+
+
+# ---------------------- Login Paths ----------------------
+def legacy_login(u):
+    # What main.py used to do on every attempt
+    return supabase.table("users").select("*").eq("username", u["username"]).eq("password", u["password"]).execute().data[0]
+
+
+def projected_login(u):
+    return auth._lookup(u["username"], u["password"])
+
+
+def cached_login(u):
+    return auth.authenticate(u["username"], u["password"])
+
+
+tokens = {}
+
+
+def token_resume(u):
+    token = tokens.get(u["username"])
+    if token is None:
+        token = tokens[u["username"]] = auth.issue_token(auth.authenticate(u["username"], u["password"]))
+    return auth.resume_session(token)
+
+
+def run(name, login):
+    auth.invalidate_users()
+    tokens.clear()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(login, attempts))
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for r in results if not r)
+    print(f"  {name:<28} {args.logins / elapsed:>10.0f} logins/s   {elapsed * 1000 / args.logins:>7.3f} ms/login   failed: {failed}")
+
+
+print(f"\nLogin throughput ({args.logins} logins, {args.threads} threads, {len(users)} users, backend={os.environ['DB_BACKEND']}):")
+run("select * (old)", legacy_login)
+run("projected lookup", projected_login)
+run("directory cache", cached_login)
+run("session token resume", token_resume)
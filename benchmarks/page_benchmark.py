@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+parser = argparse.ArgumentParser(description="Render every page headlessly and compare against a stored baseline.")
+parser.add_argument("--db", default=os.path.join(BENCH_DIR, "bench.db"), help="SQLite database (generated if missing).")
+parser.add_argument("--runs", type=int, default=5, help="Warm renders per scenario.")
+parser.add_argument("--only", action="append", help="Run only these scenarios (repeatable).")
+parser.add_argument("--baseline", default=os.path.join(BENCH_DIR, "baseline.json"))
+parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline.")
+parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                    help="Allowed warm latency growth over the baseline (0.5 = +50%%).")
+parser.add_argument("--latency-slack-ms", type=float, default=50,
+                    help="Latency growth below this many ms is never a regression.")
+parser.add_argument("--memory-tolerance", type=float, default=0.25, help="Allowed peak memory growth.")
+parser.add_argument("--rows-tolerance", type=float, default=0.1,
+                    help="Allowed growth in rows read (0.1 = +10%%); windows relative to today shift a little.")
+parser.add_argument("--strict-timing", action="store_true",
+                    help="Fail on latency and memory too, even if the baseline was recorded on another machine.")
+args = parser.parse_args()
+
+# The app reads its backend at import time, so this must come first.
+os.environ["DB_BACKEND"] = "sqlite"
+os.environ["SQLITE_PATH"] = args.db
+if not os.path.exists(args.db):
+    from generate_data import generate_college, write_sqlite
+    print(f"Generating benchmark data into {args.db} ...")
+    write_sqlite(args.db, generate_college())
+
+import streamlit as st
+from streamlit.logger import set_log_level
+from streamlit.testing.v1 import AppTest
+from supabase_setup import init_supabase
+from query_metrics import recent_renders
+import shared_cache
+from auth import invalidate_users
+
+# Outside a running server Streamlit warns on every cache clear and deprecation
+set_log_level("error")
+
+PAGES = {
+    "main": "main.py",
+    "timetable_view": "pages/1_timetable_view.py",
+    "notification_history": "pages/2_notification_history.py",
+    "notification_history_student": "pages/3_notification_history_student.py",
+    "monthly_report": "pages/4_monthly_report.py",
+    "admin_panel": "pages/5_admin_panel.py",
+}
+
+
+# ---------------------- Scenarios ----------------------
+def pick_users():
+    client = init_supabase()
+    timetable = client.table("timetable").select("faculty").execute().data
+    loads = {}
+    for row in timetable:
+        loads[row["faculty"]] = loads.get(row["faculty"], 0) + 1
+    busiest = max(loads, key=loads.get)
+
+    def user(username):
+        return client.table("users").select("username, role, division, divisions, subjects") \
+            .eq("username", username).execute().data[0]
+
+    student = client.table("users").select("username").eq("role", "student").order("username").limit(1).execute().data[0]
+    return {"faculty": user(busiest), "student": user(student["username"]), "admin": user("admin@ldce.ac.in")}
+
+
+def scenarios():
+    # (name, page, role) - the same page is measured once per audience
+    return [
+        ("login", "main", None),
+        ("timetable_faculty", "timetable_view", "faculty"),
+        ("timetable_student", "timetable_view", "student"),
+        ("history_faculty", "notification_history", "faculty"),
+        ("reports_student", "notification_history_student", "student"),
+        ("inbox_faculty", "notification_history_student", "faculty"),
+        ("monthly_report_faculty", "monthly_report", "faculty"),
+        ("monthly_report_admin", "monthly_report", "admin"),
+        ("admin_panel", "admin_panel", "admin"),
+    ]
+
+
+def render(page, user):
+    app = AppTest.from_file(os.path.join(ROOT, PAGES[page]), default_timeout=120)
+    if user:
+        app.session_state.user = dict(user)
+    start = time.perf_counter()
+    app.run()
+    elapsed = (time.perf_counter() - start) * 1000
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    return elapsed, recent_renders(page)[-1].totals()
+
+
+def clear_caches():
+    st.cache_data.clear()
+    shared_cache.clear()
+    invalidate_users()
+
+
+def measure(page, user):
+    # Cold renders start from empty process caches, as after a deploy; warm
+    # renders are new sessions on a warmed-up process. Peak memory comes from
+    # a separate traced cold render, since tracemalloc slows everything down.
+    clear_caches()
+    cold_ms, cold = render(page, user)
+
+    clear_caches()
+    tracemalloc.start()
+    render(page, user)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    warm = [render(page, user) for _ in range(args.runs)]
+    return {
+        "cold_ms": round(cold_ms, 1),
+        "warm_ms": round(statistics.median(ms for ms, _ in warm), 1),
+        "queries": cold["queries"],
+        "warm_queries": warm[-1][1]["queries"],
+        "rows": cold["rows"],
+        "db_ms": cold["db_ms"],
+        "peak_kb": round(peak / 1024),
+    }
+
+
+# ---------------------- Baseline ----------------------
+# Query and row counts are the same on every machine and always gate the
+# run. Latency and memory only do when the baseline was recorded here
+# (--update-baseline on this machine); otherwise they are reported only.
+MACHINE_KEY = "_machine"
+
+
+def machine():
+    return f"{platform.node()} {platform.machine()} {os.cpu_count()} cpu python {platform.python_version()}"
+
+
+def regressions(name, result, baseline):
+    counts, timing = [], []
+    base = baseline.get(name)
+    if not base:
+        return counts, timing
+    for key in ("queries", "warm_queries"):
+        if result[key] > base[key]:
+            counts.append(f"{name}: {result[key]} {key.replace('_', ' ')} (baseline {base[key]})")
+    if result["rows"] > base["rows"] * (1 + args.rows_tolerance):
+        counts.append(f"{name}: {result['rows']} rows read (baseline {base['rows']})")
+    allowed_ms = max(base["warm_ms"] * (1 + args.latency_tolerance), base["warm_ms"] + args.latency_slack_ms)
+    if result["warm_ms"] > allowed_ms:
+        timing.append(f"{name}: {result['warm_ms']} ms warm render (baseline {base['warm_ms']} ms)")
+    if result["peak_kb"] > base["peak_kb"] * (1 + args.memory_tolerance):
+        timing.append(f"{name}: {result['peak_kb']} KB peak memory (baseline {base['peak_kb']} KB)")
+    return counts, timing
+
+
+baseline = {}
+if os.path.exists(args.baseline):
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+timing_gates = args.strict_timing or baseline.get(MACHINE_KEY) == machine()
+
+users = pick_users()
+results, failures, advisories = {}, [], []
+print(f"\n{'scenario':<26} {'cold ms':>9} {'warm ms':>9} {'queries':>8} {'warm q':>7} {'rows':>7} {'db ms':>8} {'peak KB':>9}")
+for name, page, role in scenarios():
+    if args.only and name not in args.only:
+        continue
+    result = measure(page, users.get(role))
+    results[name] = result
+    print(f"{name:<26} {result['cold_ms']:>9} {result['warm_ms']:>9} {result['queries']:>8} {result['warm_queries']:>7} "
+          f"{result['rows']:>7} {result['db_ms']:>8} {result['peak_kb']:>9}")
+    counts, timing = regressions(name, result, baseline)
+    failures += counts
+    (failures if timing_gates else advisories).extend(timing)
+
+if args.update_baseline:
+    with open(args.baseline, "w", encoding="utf-8") as f:
+        json.dump({**baseline, **results, MACHINE_KEY: machine()}, f, indent=2, sort_keys=True)
+    print(f"\nBaseline written to {args.baseline}")
+    exit()
+
+if advisories:
+    print(f"\nTiming differences (advisory; the baseline was recorded on {baseline.get(MACHINE_KEY) or 'another machine'}):")
+    for advisory in advisories:
+        print(f"  - {advisory}")
+if failures:
+    print("\nRegressions against the baseline:")
+    for failure in failures:
+        print(f"  - {failure}")
+    exit(1)
+elif baseline:
+    print("\nNo regressions against the baseline.")
@@ -0,0 +1,148 @@
+from supabase_setup import init_supabase
+
+DEFAULT_CHUNK_SIZE = 500
+SCAN_PAGE_SIZE = 1000
+
+
+# ---------------------- Diffing ----------------------
+def _norm(value):
+    # Treat "", [] and missing columns the same as NULL so a re-upload of an
+    # unchanged file produces no updates.
+    return value if value not in ("", [], None) else None
+
+
+def row_key(row, key_fields):
+    return tuple(_norm(row.get(field)) for field in key_fields)
+
+
+def diff_rows(existing, desired, key_fields):
+    stored = {row_key(row, key_fields): row for row in existing}
+    wanted = {}
+    duplicates = []
+    for row in desired:
+        key = row_key(row, key_fields)
+        if key in wanted:
+            duplicates.append(row)
+        wanted[key] = row
+
+    inserts, updates = [], []
+    for key, row in wanted.items():
+        current = stored.get(key)
+        if current is None:
+            inserts.append(row)
+        elif any(_norm(current.get(field)) != _norm(value) for field, value in row.items()):
+            update = dict(row)
+            if "id" in current:
+                update["id"] = current["id"]
+            updates.append(update)
+
+    deletes = [row for key, row in stored.items() if key not in wanted]
+    return inserts, updates, deletes, duplicates
+
+
+# ---------------------- Bulk Reads ----------------------
+def scan_table(table, columns, apply_filters=None, page_size=SCAN_PAGE_SIZE):
+    # Walks a whole table in id order, one bounded page per request.
+    client = init_supabase()
+    last_id = None
+    while True:
+        query = client.table(table).select(columns)
+        if apply_filters:
+            query = apply_filters(query)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.order("id").limit(page_size).execute().data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+# ---------------------- Bulk Writes ----------------------
+def chunked(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _delete_rows(table, rows, key_fields, chunk_size):
+    client = init_supabase()
+    requests = 0
+    ids = [row["id"] for row in rows if "id" in row]
+    for chunk in chunked(ids, chunk_size):
+        client.table(table).delete().in_("id", chunk).execute()
+        requests += 1
+
+    # Tables without a surrogate id fall back to one keyed delete per row.
+    for row in rows:
+        if "id" in row:
+            continue
+        query = client.table(table).delete()
+        for field in key_fields:
+            value = row.get(field)
+            query = query.is_(field, "null") if value is None else query.eq(field, value)
+        query.execute()
+        requests += 1
+    return requests
+
+
+def sync_table(table, desired, key_fields, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False, prune=True):
+    client = init_supabase()
+    # Paged: a single select stops at the API's row cap (1000 on Supabase),
+    # which would make the rest of the stored rows look new.
+    existing = list(scan_table(table, "*"))
+    inserts, updates, deletes, duplicates = diff_rows(existing, desired, key_fields)
+    if not prune:
+        deletes = []
+
+    summary = {
+        "table": table,
+        "stored": len(existing),
+        "desired": len(desired),
+        "inserts": len(inserts),
+        "updates": len(updates),
+        "deletes": len(deletes),
+        "duplicates": len(duplicates),
+        "unchanged": len(desired) - len(duplicates) - len(inserts) - len(updates),
+        "requests": 0,
+        "dry_run": dry_run,
+        "inserted": [row_key(row, key_fields) for row in inserts],
+        "updated": [row_key(row, key_fields) for row in updates],
+        "deleted": [row_key(row, key_fields) for row in deletes],
+    }
+    if dry_run:
+        return summary
+
+    # Inserts and updates go first so a failure part-way never leaves the
+    # table with rows removed but not yet replaced; re-running converges.
+    on_conflict = None if updates and all("id" in row for row in updates) else ",".join(key_fields)
+    for chunk in chunked(inserts, chunk_size):
+        client.table(table).insert(chunk).execute()
+        summary["requests"] += 1
+    for chunk in chunked(updates, chunk_size):
+        if on_conflict:
+            client.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+        else:
+            client.table(table).upsert(chunk).execute()
+        summary["requests"] += 1
+    summary["requests"] += _delete_rows(table, deletes, key_fields, chunk_size)
+    return summary
+
+
+def print_summary(summary, verbose=False):
+    mode = "Dry run" if summary["dry_run"] else "Sync completed"
+    print(f"\n{mode} for '{summary['table']}':")
+    print(f"  Stored rows     : {summary['stored']}")
+    print(f"  Rows in file    : {summary['desired']}")
+    print(f"  Inserted        : {summary['inserts']}")
+    print(f"  Updated         : {summary['updates']}")
+    print(f"  Deleted         : {summary['deletes']}")
+    print(f"  Unchanged       : {summary['unchanged']}")
+    if summary["duplicates"]:
+        print(f"  Duplicate keys  : {summary['duplicates']} (last row in file wins)")
+    if not summary["dry_run"]:
+        print(f"  Bulk requests   : {summary['requests']}")
+
+    if verbose or summary["dry_run"]:
+        for label, action in (("inserted", "+ insert"), ("updated", "~ update"), ("deleted", "- delete")):
+            for key in summary[label]:
+                print(f"    {action} {key}")
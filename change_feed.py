@@ -0,0 +1,90 @@
+import os
+from datetime import datetime, timedelta, timezone
+from supabase_setup import init_supabase
+
+TOMBSTONE_TABLE = "notification_tombstones"
+TOMBSTONE_COLUMNS = ("role", "username", "faculty", "division", "date")
+
+# Re-read a small window before the cursor so rows stamped slightly out of
+# order by another app process (clock skew, in-flight writes) are not missed.
+OVERLAP = timedelta(seconds=float(os.getenv("CHANGE_FEED_OVERLAP", "5")))
+
+
+def now_stamp():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _rewind(stamp):
+    return (datetime.fromisoformat(stamp) - OVERLAP).isoformat()
+
+
+def _apply_scope(query, scope):
+    # scope is a tuple of (operator, column, value) filters, e.g.
+    # (("eq", "role", "faculty"), ("gte", "date", "2025-08-01"))
+    for op, column, value in scope:
+        query = getattr(query, op)(column, value)
+    return query
+
+
+# ---------------------- Tombstones ----------------------
+def record_tombstones(deleted_rows):
+    rows = [
+        {"id": row["id"], "deleted_at": now_stamp(), **{col: row.get(col) for col in TOMBSTONE_COLUMNS}}
+        for row in deleted_rows if "id" in row
+    ]
+    if rows:
+        init_supabase().table(TOMBSTONE_TABLE).upsert(rows).execute()
+
+
+# ---------------------- Session Feed ----------------------
+class NotificationFeed:
+    def __init__(self, scope):
+        self.scope = scope
+        self.rows = {}
+        self.cursor = None
+
+    def _advance(self, stamps):
+        stamps = [s for s in stamps + [self.cursor] if s]
+        if stamps:
+            self.cursor = max(stamps, key=datetime.fromisoformat)
+
+    def sync(self):
+        client = init_supabase()
+        if self.cursor is None:
+            # Stamp before reading so anything written during the full load
+            # is picked up again by the first delta.
+            started = now_stamp()
+            rows = _apply_scope(client.table("notifications").select("*"), self.scope).execute().data or []
+            self.rows = {row["id"]: row for row in rows}
+            self.cursor = started
+            return len(rows)
+
+        since = _rewind(self.cursor)
+        changed = _apply_scope(client.table("notifications").select("*"), self.scope) \
+            .gte("updated_at", since).execute().data or []
+        removed = _apply_scope(client.table(TOMBSTONE_TABLE).select("id, deleted_at"), self.scope) \
+            .gte("deleted_at", since).execute().data or []
+
+        for row in changed:
+            self.rows[row["id"]] = row
+        for tombstone in removed:
+            self.rows.pop(tombstone["id"], None)
+        self._advance([row.get("updated_at") for row in changed] + [t.get("deleted_at") for t in removed])
+        return len(changed) + len(removed)
+
+    def values(self):
+        return list(self.rows.values())
+
+
+def session_feed(state, name, scope, sync=True):
+    # One feed per session and scope; a new scope (say, the next day) starts
+    # a fresh feed instead of mixing rows from two windows. sync=False hands
+    # back the feed unsynced, e.g. to sync it alongside other reads.
+    key = f"feed_{name}"
+    feed = state.get(key)
+    if feed is None or feed.scope != scope:
+        feed = NotificationFeed(scope)
+        state[key] = feed
+    if sync:
+        feed.sync()
+    return feed
@@ -0,0 +1,132 @@
+import csv
+import os
+import tempfile
+from supabase_setup import init_supabase
+from bulk_sync import SCAN_PAGE_SIZE, scan_table
+
+EXPORT_COLUMNS = [
+    "date", "day", "time", "division", "subject", "faculty",
+    "username", "role", "type", "status", "message", "response", "timestamp",
+]
+
+FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/octet-stream",
+}
+
+
+def _flatten(row):
+    response = row.get("response")
+    if isinstance(response, dict):
+        response = response.get("message", "")
+    return [response if col == "response" else row.get(col) for col in EXPORT_COLUMNS]
+
+
+# ---------------------- Chunk Writers ----------------------
+# Each writer receives one page of rows at a time and never holds more.
+class XlsxWriter:
+    def __init__(self, path, sheet_name="Notifications"):
+        import xlsxwriter
+        # constant_memory flushes every finished row to disk
+        self.workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+        self.sheet = self.workbook.add_worksheet(sheet_name)
+        self.sheet.write_row(0, 0, EXPORT_COLUMNS)
+        self.next_row = 1
+
+    def write(self, rows):
+        for row in rows:
+            self.sheet.write_row(self.next_row, 0, ["" if v is None else v for v in _flatten(row)])
+            self.next_row += 1
+
+    def close(self):
+        self.workbook.close()
+
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(_flatten(row) for row in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export needs the optional 'pyarrow' package.")
+        self.pa = pa
+        self.schema = pa.schema([(col, pa.string()) for col in EXPORT_COLUMNS])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        flat = [_flatten(row) for row in rows]
+        columns = [[None if r[i] is None else str(r[i]) for r in flat] for i in range(len(EXPORT_COLUMNS))]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+WRITERS = {"xlsx": XlsxWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+
+# ---------------------- Export ----------------------
+def notification_filters(start_date=None, end_date=None, divisions=None, **scope):
+    def apply(query):
+        for column, value in scope.items():
+            query = query.eq(column, value)
+        if divisions:
+            query = query.in_("division", divisions)
+        if start_date:
+            query = query.gte("date", str(start_date))
+        if end_date:
+            query = query.lte("date", str(end_date))
+        return query
+    return apply
+
+
+def count_rows(apply_filters):
+    query = init_supabase().table("notifications").select("id", count="exact", head=True)
+    return apply_filters(query).execute().count or 0
+
+
+def export_notifications(fmt, apply_filters, progress=None, page_size=SCAN_PAGE_SIZE):
+    # Streams notifications page by page into a temporary file and returns
+    # its path; the caller owns (and removes) the file.
+    total = count_rows(apply_filters)
+    fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+    os.close(fd)
+
+    try:
+        writer = WRITERS[fmt](path)
+    except Exception:
+        os.remove(path)
+        raise
+    written = 0
+    chunk = []
+    try:
+        for row in scan_table("notifications", "id, " + ", ".join(EXPORT_COLUMNS), apply_filters, page_size):
+            chunk.append(row)
+            if len(chunk) == page_size:
+                writer.write(chunk)
+                written += len(chunk)
+                chunk = []
+                if progress:
+                    progress(written, total)
+        writer.write(chunk)
+        written += len(chunk)
+    finally:
+        writer.close()
+
+    if progress:
+        progress(written, max(total, written))
+    return path, written
@@ -1,5 +1,7 @@
 import streamlit as st
 from supabase_setup import init_supabase
+from query_metrics import instrument_page
+from auth import authenticate, issue_token, restore_session, revoke_token, session_cookie_script
 
 # --------------------------
 # App Configuration
@@ -36,12 +38,25 @@ st.title("Class Schedule & Notification Tracker")
 # Supabase Configuration
 # --------------------------
 supabase = init_supabase()
+instrument_page("main", st.session_state)
 
 # --------------------------
 # Session Initialization
 # --------------------------
 if "user" not in st.session_state:
     st.session_state.user = None
+restore_session(st.session_state, st.context.cookies)
+
+# Older versions kept the token in the URL; such links no longer log anyone in.
+if "session" in st.query_params:
+    del st.query_params["session"]
+
+# Login and logout leave a cookie change for the next render to apply.
+if "pending_cookie" in st.session_state:
+    st.html(
+        session_cookie_script(st.session_state.pop("pending_cookie"), secure=(st.context.url or "").startswith("https")),
+        unsafe_allow_javascript=True
+    )
 
 # --------------------------
 # Login Section
@@ -55,10 +70,11 @@ if st.session_state.user is None:
 
     if st.button("➡️ Login"):
         try:
-            response = supabase.table('users').select("*").eq('username', email).eq('password', password).execute()
-            if response.data:
-                user_found = response.data[0]
+            user_found = authenticate(email, password)
+            if user_found:
                 st.session_state.user = user_found
+                st.session_state.session_token = issue_token(user_found)
+                st.session_state.pending_cookie = st.session_state.session_token
                 st.success(f"✅ Welcome, **{user_found['username']}** ({user_found['role'].capitalize()})")
                 st.rerun()
             else:
@@ -85,6 +101,9 @@ else:
         """, unsafe_allow_html=True)
 
         if st.button("Logout"):
+            if st.session_state.get("session_token"):
+                revoke_token(st.session_state.pop("session_token"))
+            st.session_state.pending_cookie = None
             st.session_state.user = None
             st.rerun()
 
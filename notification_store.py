@@ -0,0 +1,250 @@
+import os
+from datetime import date, timedelta
+from supabase_setup import init_supabase
+from shared_cache import bump, cached
+from bulk_sync import scan_table
+from rollup_store import refresh_for, refresh_partitions
+from change_feed import now_stamp, record_tombstones
+from time_slots import slot_order
+
+
+# ---------------------- Feed Scopes ----------------------
+# Filter tuples understood by change_feed.NotificationFeed.
+def faculty_scope(username, start_date, end_date=None):
+    return (
+        ("eq", "role", "faculty"),
+        ("eq", "username", username),
+        ("gte", "date", start_date),
+        ("lte", "date", end_date or start_date),
+    )
+
+
+# ---------------------- Slot Index ----------------------
+def slot_key(date, entry):
+    return (date, entry.get("time"), entry.get("subject"), entry.get("division") or "")
+
+
+def index_by_slot(notifications):
+    index = {}
+    for note in notifications:
+        index.setdefault(slot_key(note.get("date"), note), note)
+    return index
+
+
+# ---------------------- Day Dashboard ----------------------
+def fetch_day_dashboard(date, faculty=None, division=None):
+    # One faculty member's (or division's) classes on a date, in time order,
+    # each with the faculty status posted for it (status is None while
+    # unmarked) and its student absence reports: one round trip (sql/009).
+    rows = init_supabase().rpc(
+        "today_dashboard", {"p_date": str(date), "p_faculty": faculty, "p_division": division}
+    ).execute().data or []
+    return sorted(rows, key=lambda row: slot_order(row.get("time")))
+
+
+def dashboard_note(row, date):
+    # The faculty notification behind a marked dashboard row, keyed the way
+    # delete_notification() matches it.
+    if not row.get("status"):
+        return None
+    return {
+        "faculty": row.get("faculty"), "division": row.get("division"), "subject": row.get("subject"),
+        "date": str(date), "time": row.get("time"), "role": "faculty", "username": row.get("marked_by"),
+        "status": row["status"],
+    }
+
+
+# ---------------------- History Pages ----------------------
+HISTORY_PAGE_SIZE = 10
+
+
+def _history_filters(query, scope, subject=None, start_date=None, end_date=None):
+    for column, value in scope.items():
+        query = query.eq(column, value)
+    if subject:
+        query = query.eq("subject", subject)
+    if start_date:
+        query = query.gte("date", str(start_date))
+    if end_date:
+        query = query.lte("date", str(end_date))
+    return query
+
+
+def count_history(scope, subject=None, start_date=None, end_date=None):
+    def load():
+        query = init_supabase().table("notifications").select("id", count="exact", head=True)
+        return _history_filters(query, scope, subject, start_date, end_date).execute().count or 0
+    key = ("history_count", tuple(sorted(scope.items())), subject, str(start_date), str(end_date))
+    return cached("notifications", key, load)
+
+
+def history_subjects(scope):
+    # Subjects the scope has history for, from the notification_subjects
+    # view (sql/011) rather than the current timetable.
+    def load():
+        query = init_supabase().table("notification_subjects").select("subject")
+        return sorted({row["subject"] for row in _history_filters(query, scope).execute().data or []})
+    return cached("notifications", ("history_subjects", tuple(sorted(scope.items()))), load)
+
+
+def fetch_history_page(scope, subject=None, start_date=None, end_date=None, cursor=None,
+                       page_size=HISTORY_PAGE_SIZE, columns="*"):
+    # Keyset pagination: newest first, continuing strictly after the last
+    # (timestamp, id) of the previous page so each page reads page_size rows.
+    query = init_supabase().table("notifications").select(columns)
+    query = _history_filters(query, scope, subject, start_date, end_date)
+    if cursor:
+        timestamp, row_id = cursor
+        query = query.or_(f'timestamp.lt."{timestamp}",and(timestamp.eq."{timestamp}",id.lt.{row_id})')
+    return query.order("timestamp", desc=True).order("id", desc=True).limit(page_size).execute().data or []
+
+
+def page_cursor(rows):
+    return (rows[-1]["timestamp"], rows[-1]["id"]) if rows else None
+
+
+# ---------------------- Faculty Inbox ----------------------
+# Student reports grouped per slot by the faculty_inbox view (sql/007), so
+# thirty reports of one missed lecture arrive as one row with a count.
+INBOX_DAYS = int(os.getenv("FACULTY_INBOX_DAYS", "14"))
+INBOX_PAGE_SIZE = 20          # older groups per "Load older" click
+INBOX_RECENT_PAGE_SIZE = 100  # recent-window groups per page
+
+
+def fetch_inbox(faculty, start_date=None, end_date=None, page=0, page_size=INBOX_PAGE_SIZE):
+    # One page of report groups, newest first. Returns (groups, more), where
+    # more says whether another page follows.
+    def load():
+        query = init_supabase().table("faculty_inbox").select("*").eq("faculty", faculty)
+        if start_date:
+            query = query.gte("date", str(start_date))
+        if end_date:
+            query = query.lt("date", str(end_date))
+        rows = query.order("date", desc=True).order("latest", desc=True) \
+            .range(page * page_size, (page + 1) * page_size).execute().data or []
+        return rows[:page_size], len(rows) > page_size
+    key = ("inbox", faculty, str(start_date), str(end_date), page, page_size)
+    return cached("notifications", key, load, partitions=[faculty_partition(faculty)])
+
+
+def _match_group(query, group):
+    query = query.eq("role", "student")
+    for column in ("faculty", "subject", "date", "time"):
+        query = query.eq(column, group[column])
+    return query.is_("division", "null") if group.get("division") is None else query.eq("division", group["division"])
+
+
+# ---------------------- Student Report Weeks ----------------------
+# A student's reports are bucketed per ISO week (Monday to Sunday) by the
+# student_report_weeks view (sql/008); each week's reports are read only
+# when it is shown.
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def fetch_report_weeks(username):
+    # [{"week_start": "YYYY-MM-DD", "reports": n, "answered": n}, ...], newest first.
+    def load():
+        return init_supabase().table("student_report_weeks").select("week_start, reports, answered") \
+            .eq("username", username).order("week_start", desc=True).execute().data or []
+    return cached("notifications", ("report_weeks", username), load, partitions=[student_partition(username)])
+
+
+def fetch_report_week(username, start):
+    def load():
+        end = date.fromisoformat(start) + timedelta(days=6)
+        return init_supabase().table("notifications").select("*") \
+            .eq("role", "student").eq("username", username) \
+            .gte("date", start).lte("date", str(end)) \
+            .order("date").order("timestamp").execute().data or []
+    return cached("notifications", ("report_week", username, start), load, partitions=[student_partition(username)])
+
+
+# ---------------------- Term Scans ----------------------
+def scan_notifications(start_date, end_date, faculty=None,
+                       columns="id, role, username, faculty, division, subject, date, time, status, response"):
+    def filters(query):
+        query = query.gte("date", str(start_date)).lte("date", str(end_date))
+        return query.eq("faculty", faculty) if faculty else query
+    return list(scan_table("notifications", columns, filters))
+
+
+# ---------------------- Cache Partitions ----------------------
+# Shared-cache entries built from notifications name the faculty members
+# they cover; every write bumps the faculty it touched, so it is visible on
+# the very next render without dropping other faculty members' entries.
+def faculty_partition(faculty):
+    return ("faculty", faculty)
+
+
+def student_partition(username):
+    return ("student", username)
+
+
+def _changed(notes):
+    partitions = [faculty_partition(note.get("faculty")) for note in notes]
+    partitions += [student_partition(note.get("username")) for note in notes if note.get("role") == "student"]
+    bump("notifications", partitions)
+
+
+# ---------------------- Writes ----------------------
+# A notification is identified by its slot and author; the unique index on
+# these columns (sql/005) makes repeated clicks and retries land on one row.
+NOTIFICATION_KEY = ("faculty", "division", "subject", "date", "time", "role", "username")
+NOTIFICATION_CONFLICT = ",".join(NOTIFICATION_KEY)
+
+
+def _match_key(query, note):
+    for column in NOTIFICATION_KEY:
+        value = note.get(column)
+        query = query.is_(column, "null") if value is None else query.eq(column, value)
+    return query
+
+
+# Every write refreshes the monthly rollup partition the notification
+# belongs to, so reports never need to re-aggregate raw notifications, and
+# stamps updated_at (or leaves a tombstone) for session change feeds.
+def insert_notification(note):
+    init_supabase().table("notifications") \
+        .upsert({**note, "updated_at": now_stamp()}, on_conflict=NOTIFICATION_CONFLICT).execute()
+    _changed([note])
+    refresh_for(note)
+
+
+def insert_notifications(notes):
+    # Bulk marking: all rows in one upsert, rollup refreshed once.
+    if not notes:
+        return
+    stamp = now_stamp()
+    init_supabase().table("notifications") \
+        .upsert([{**note, "updated_at": stamp} for note in notes], on_conflict=NOTIFICATION_CONFLICT).execute()
+    _changed(notes)
+    refresh_partitions((note.get("division"), note.get("subject"), note.get("date")) for note in notes)
+
+
+def delete_notification(note):
+    deleted = _match_key(init_supabase().table("notifications").delete(), note).execute().data or []
+    record_tombstones(deleted)
+    _changed([note] + deleted)
+    refresh_for(note)
+
+
+def respond_to_group(group, response):
+    # One update answers every report in the group that is still pending.
+    updated = _match_group(
+        init_supabase().table("notifications").update({"response": response, "updated_at": now_stamp()}),
+        group
+    ).is_("response", "null").execute().data or []
+    _changed([group] + updated)
+    refresh_for(group)
+    return len(updated)
+
+
+def delete_group(group):
+    # Removes the group's pending reports; answered ones are kept.
+    deleted = _match_group(init_supabase().table("notifications").delete(), group) \
+        .is_("response", "null").execute().data or []
+    record_tombstones(deleted)
+    _changed([group] + deleted)
+    refresh_for(group)
+    return len(deleted)
@@ -2,11 +2,22 @@ import streamlit as st
 import datetime
 import pandas as pd
 from supabase_setup import init_supabase
+from query_metrics import instrument_page
+from auth import restore_session
+from timetable_store import WEEK_DAYS, get_user_classes, get_user_week
+from notification_store import (
+    dashboard_note, delete_notification, faculty_scope, fetch_day_dashboard, index_by_slot, insert_notification,
+    insert_notifications, slot_key
+)
+from change_feed import session_feed
+from parallel_reads import fetch_parallel
 
 st.set_page_config(page_title="timetable", layout="wide")  # optional but helpful
 
 # Initialize Supabase
 supabase = init_supabase()
+restore_session(st.session_state, st.context.cookies)
+instrument_page("timetable_view", st.session_state)
 
 # -----------------------------
 # Helpers
@@ -17,21 +28,35 @@ def get_today():
 def get_today_date():
     return datetime.datetime.now().strftime("%Y-%m-%d")
 
-def get_user_timetable(user):
-    all_timetable = supabase.table("timetable").select("*").execute().data
-    if user["role"] == "faculty":
-        return [entry for entry in all_timetable if entry.get("faculty") == user["username"]]
-    elif user["role"] == "student":
-        return [entry for entry in all_timetable if entry.get("division") == user.get("division")]
-    return []
-
-def get_notifications():
-    return supabase.table("notifications").select("*").execute().data
-
-def render_timetable(entries, day, notifications, user):
-    today_entries = [e for e in entries if e.get("day") == day]
-    today_entries = sorted(today_entries, key=lambda x: x.get("time", ""))
-
+STATUS_MESSAGES = {
+    "Class Happened": "Class was held successfully.",
+    "Cancelled": "Class was cancelled.",
+    "No Students Present": "No students attended the lecture.",
+}
+
+def build_note(user, entry, day, date, status):
+    return {
+        "username": user["username"],
+        "role": "faculty",
+        "subject": entry["subject"],
+        "division": entry.get("division", ""),
+        "day": day,
+        "date": date,
+        "time": entry["time"],
+        "faculty": entry.get("faculty"),
+        "type": entry.get("type", ""),
+        "status": status,
+        "message": STATUS_MESSAGES[status],
+        "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+def get_slot_notifications(user, date, end_date=None, feed_name="timetable_view"):
+    if user["role"] != "faculty":
+        return {}
+    feed = session_feed(st.session_state, feed_name, faculty_scope(user["username"], date, end_date))
+    return index_by_slot(feed.values())
+
+def render_timetable(today_entries, day, date, slot_notifications, user):
     if not today_entries:
         st.info("No classes scheduled.")
     else:
@@ -45,79 +70,82 @@ def render_timetable(entries, day, notifications, user):
             )
 
             if user["role"] == "faculty":
-                existing = [n for n in notifications if n.get("role") == "faculty" and
-                            n.get("username") == user["username"] and
-                            n.get("subject") == entry["subject"] and
-                            n.get("day") == entry["day"] and
-                            n.get("time") == entry["time"]]
+                existing = slot_notifications.get(slot_key(date, entry))
+                if entry.get("reports"):
+                    pending = f", {entry['pending_reports']} awaiting your response" if entry.get("pending_reports") else ""
+                    st.caption(f"⚠️ {entry['reports']} student absence report(s){pending}")
 
                 if not existing:
                     col1, col2, col3 = st.columns(3)
 
                     if col1.button("✅ Class Happened", key=f"happened_{idx}_{day}"):
-                        new_note = {
-                            "username": user["username"],
-                            "role": "faculty",
-                            "subject": entry["subject"],
-                            "division": entry.get("division", ""),
-                            "day": day,
-                            "date": get_today_date(),
-                            "time": entry["time"],
-                            "faculty": entry.get("faculty"),
-                            "type": entry.get("type", ""),
-                            "status": "Class Happened",  # ✅ Fixed label
-                            "message": "Class was held successfully.",
-                            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                        supabase.table("notifications").insert(new_note).execute()
+                        new_note = build_note(user, entry, day, date, "Class Happened")
+                        insert_notification(new_note)
                         st.success("📩 Notification: Class Happened added.")
                         st.rerun()
 
                     if col2.button("❌ Class Cancelled", key=f"cancelled_{idx}_{day}"):
-                        new_note = {
-                            "username": user["username"],
-                            "role": "faculty",
-                            "subject": entry["subject"],
-                            "division": entry.get("division", ""),
-                            "day": day,
-                            "date": get_today_date(),
-                            "time": entry["time"],
-                            "faculty": entry.get("faculty"),
-                            "type": entry.get("type", ""),
-                            "status": "Cancelled",  # ✅ Consistent
-                            "message": "Class was cancelled.",
-                            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                        supabase.table("notifications").insert(new_note).execute()
+                        new_note = build_note(user, entry, day, date, "Cancelled")
+                        insert_notification(new_note)
                         st.warning("📩 Notification: Class Cancelled added.")
                         st.rerun()
 
                     if col3.button("🚫 No Students Present", key=f"absent_{idx}_{day}"):
-                        new_note = {
-                            "username": user["username"],
-                            "role": "faculty",
-                            "subject": entry["subject"],
-                            "division": entry.get("division", ""),
-                            "day": day,
-                            "date": get_today_date(),
-                            "time": entry["time"],
-                            "faculty": entry.get("faculty"),
-                            "type": entry.get("type", ""),
-                            "status": "No Students Present",  # ✅ Consistent
-                            "message": "No students attended the lecture.",
-                            "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                        supabase.table("notifications").insert(new_note).execute()
+                        new_note = build_note(user, entry, day, date, "No Students Present")
+                        insert_notification(new_note)
                         st.warning("📩 Notification: No Students Present added.")
                         st.rerun()
                 else:
                     col1, col2 = st.columns([6, 1])
-                    col1.info(f"📌 Notification already sent: {existing[0]['status']}")
+                    col1.info(f"📌 Notification already sent: {existing['status']}")
                     if col2.button("↩️ Undo", key=f"undo_{idx}_{day}"):
-                        supabase.table("notifications").delete().eq("timestamp", existing[0]["timestamp"]).execute()
+                        delete_notification(existing)
                         st.warning("⏪ Notification removed.")
                         st.rerun()
 
+BULK_MAX_DAYS = 31
+
+def render_bulk_marking(user, classes_for_day):
+    today = datetime.date.today()
+    col1, col2, col3 = st.columns(3)
+    start = col1.date_input("From", value=today, max_value=today, key="bulk_from")
+    end = col2.date_input("To", value=today, max_value=today, key="bulk_to")
+    default_status = col3.selectbox("Default status", list(STATUS_MESSAGES), key="bulk_default")
+
+    if end < start:
+        st.warning("'To' must not be before 'From'.")
+        return
+    if (end - start).days >= BULK_MAX_DAYS:
+        st.warning(f"Please pick at most {BULK_MAX_DAYS} days at a time.")
+        return
+
+    marked = get_slot_notifications(user, start.isoformat(), end.isoformat(), feed_name="bulk_marking")
+    pending = []
+    for offset in range((end - start).days + 1):
+        date = start + datetime.timedelta(days=offset)
+        day = date.strftime("%A")
+        for entry in classes_for_day(day):
+            if slot_key(date.isoformat(), entry) not in marked:
+                pending.append((day, date.isoformat(), entry))
+
+    if not pending:
+        st.info("Every class in this range already has a notification.")
+        return
+
+    statuses = ["Skip"] + list(STATUS_MESSAGES)
+    with st.form("bulk_marking_form"):
+        choices = []
+        for day, date, entry in pending:
+            label = f"{date} ({day}) · {entry['time']} · {entry['subject']} · Division {entry.get('division', '')}"
+            key = f"bulk_{date}_{entry['time']}_{entry['subject']}_{entry.get('division', '')}_{default_status}"
+            choices.append((day, date, entry, st.selectbox(label, statuses, index=statuses.index(default_status), key=key)))
+
+        if st.form_submit_button(f"📨 Submit {len(pending)} classes"):
+            notes = [build_note(user, entry, day, date, status) for day, date, entry, status in choices if status != "Skip"]
+            insert_notifications(notes)
+            st.session_state.timetable_message = f"✅ {len(notes)} notifications saved."
+            st.rerun()
+
 # -----------------------------
 # Page Logic
 # -----------------------------
@@ -128,26 +156,59 @@ if "user" not in st.session_state or st.session_state.user is None:
 st.title("📚 Class Timetable Viewer")
 
 user = st.session_state.user
-entries = get_user_timetable(user)
-notifications = get_notifications()
+TODAY_VIEW, WEEK_VIEW = "📅 Today's View", "📆 Full Week View"
+today, today_date = get_today(), get_today_date()
+
+# A faculty member's today view comes from one joined read: today's classes
+# with the status already posted for each. It doesn't depend on the week's
+# timetable, so the two load side by side.
+reads = {"week": lambda: get_user_week(user)}
+if user["role"] == "faculty" and st.session_state.get("view_mode", TODAY_VIEW) == TODAY_VIEW:
+    reads["today"] = lambda: fetch_day_dashboard(today_date, faculty=user["username"])
+loaded, failed = fetch_parallel(reads)
+
+if "week" in failed:
+    # The page is nothing without the timetable: one more try here before
+    # giving up, in case the pooled read only lost out to a busy moment.
+    try:
+        loaded["week"] = get_user_week(user)
+    except Exception as e:
+        st.error(f"⚠️ Could not load the timetable: {e}")
+        st.stop()
+week = loaded["week"]
 
 # Filter by Subject
-subjects = sorted(set(e["subject"] for e in entries))
+subjects = sorted(set(e["subject"] for classes in week.values() for e in classes))
 selected_subjects = st.multiselect("🎯 Filter by Subjects:", subjects, default=subjects)
-filtered = [e for e in entries if e["subject"] in selected_subjects]
+
+def filter_subjects(classes):
+    return [e for e in classes if e["subject"] in selected_subjects]
 
 # View Mode
 st.markdown("---")
-view_mode = st.radio("View Mode:", ["📅 Today's View", "📆 Full Week View"], horizontal=True)
-
-if view_mode == "📅 Today's View":
-    st.subheader(f"📌 Timetable for {get_today()} ({get_today_date()})")
-    render_timetable(filtered, get_today(), notifications, user)
-
-elif view_mode == "📆 Full Week View":
-    week_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
-    for day in week_days:
-        daily_entries = [e for e in filtered if e["day"] == day]
+view_mode = st.radio("View Mode:", [TODAY_VIEW, WEEK_VIEW], horizontal=True, key="view_mode")
+
+if view_mode == TODAY_VIEW:
+    if "timetable_message" in st.session_state:
+        st.success(st.session_state.pop("timetable_message"))
+    st.subheader(f"📌 Timetable for {today} ({today_date})")
+    if "today" in loaded:
+        classes = loaded["today"]
+        sent = {slot_key(today_date, row): dashboard_note(row, today_date) for row in classes if row.get("status")}
+    else:
+        if "today" in failed:
+            st.warning(f"⚠️ Could not load today's classes with their status: {failed['today']}")
+        classes, sent = get_user_classes(user, today), get_slot_notifications(user, today_date)
+    render_timetable(filter_subjects(classes), today, today_date, sent, user)
+
+    if user["role"] == "faculty" and st.toggle("🗂️ Mark the whole day or backfill a date range"):
+        render_bulk_marking(user, lambda day: filter_subjects(get_user_classes(user, day)))
+
+elif view_mode == WEEK_VIEW:
+    filtered = []
+    for day in WEEK_DAYS:
+        daily_entries = filter_subjects(week[day])
+        filtered.extend(daily_entries)
         if daily_entries:
             st.markdown(f"### 📌 {day}")
             df = pd.DataFrame(daily_entries)
@@ -1,13 +1,18 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
 from supabase_setup import init_supabase
+from query_metrics import instrument_page
+from auth import restore_session
+from notification_store import (
+    HISTORY_PAGE_SIZE, count_history, delete_notification, fetch_history_page, history_subjects, page_cursor
+)
 
 
 st.set_page_config(page_title="notification_history", layout="wide")  # optional but helpful
 
 
 supabase = init_supabase()
+restore_session(st.session_state, st.context.cookies)
+instrument_page("notification_history", st.session_state)
 
 # --------------------------- Auth Check ---------------------------
 if "user" not in st.session_state or st.session_state.user is None:
@@ -21,47 +26,57 @@ division = user.get("division", "")
 
 st.title("📜 Notification History")
 
-# --------------------------- Fetch Notifications ---------------------------
+# --------------------------- Scope ---------------------------
 if role == "faculty":
-    response = supabase.table("notifications").select("*").eq("role", "faculty").eq("username", username).execute()
+    scope = {"role": "faculty", "username": username}
 else:
-    # For students, fetch notifications from their division posted by faculty
-    response = supabase.table("notifications").select("*").eq("role", "faculty").eq("division", division).execute()
-
-notifications_all = response.data if response.data else []
-
-if not notifications_all:
-    st.info("No faculty-submitted notifications found.")
-    st.stop()
-
-# --------------------------- Convert to DataFrame ---------------------------
-df = pd.DataFrame(notifications_all)
+    # For students, show notifications from their division posted by faculty
+    scope = {"role": "faculty", "division": division}
 
 # --------------------------- Sidebar Filters ---------------------------
 st.sidebar.header("🔎 Filters")
 
-subject_filter = st.sidebar.selectbox("Filter by Subject", ["All"] + sorted(df["subject"].unique()))
-if subject_filter != "All":
-    df = df[df["subject"] == subject_filter]
+subjects = history_subjects(scope)
+subject_filter = st.sidebar.selectbox("Filter by Subject", ["All"] + subjects)
+subject = subject_filter if subject_filter != "All" else None
 
 start_date = st.sidebar.date_input("From Date", value=None)
 end_date = st.sidebar.date_input("To Date", value=None)
 
-if start_date:
-    df = df[pd.to_datetime(df["date"]) >= pd.to_datetime(start_date)]
-if end_date:
-    df = df[pd.to_datetime(df["date"]) <= pd.to_datetime(end_date)]
+total = count_history(scope, subject, start_date, end_date)
+
+if not total:
+    st.info("No faculty-submitted notifications found.")
+    st.stop()
 
 # --------------------------- Pagination ---------------------------
-df = df.sort_values(by="timestamp", ascending=False).reset_index(drop=True)
-page_size = 10
-page_num = st.sidebar.number_input("Page", min_value=1, max_value=max(1, (len(df) - 1) // page_size + 1), step=1)
-start_idx = (page_num - 1) * page_size
-end_idx = start_idx + page_size
-df_page = df.iloc[start_idx:end_idx]
+# Cursors are remembered per filter combination: cursors[n] is the
+# (timestamp, id) after which page n starts.
+page_size = HISTORY_PAGE_SIZE
+filter_key = (subject, str(start_date), str(end_date))
+if st.session_state.get("history_filter_key") != filter_key:
+    st.session_state.history_filter_key = filter_key
+    st.session_state.history_cursors = {1: None}
+cursors = st.session_state.history_cursors
+
+page_num = st.sidebar.number_input("Page", min_value=1, max_value=max(1, (total - 1) // page_size + 1), step=1)
+st.sidebar.caption(f"{total} notifications")
+
+# Jumping ahead walks the unseen pages reading only their keys
+known = max(p for p in cursors if p <= page_num)
+while known < page_num:
+    skipped = fetch_history_page(scope, subject, start_date, end_date, cursors[known], page_size, columns="timestamp, id")
+    if not skipped:
+        break
+    cursors[known + 1] = page_cursor(skipped)
+    known += 1
+
+page_rows = fetch_history_page(scope, subject, start_date, end_date, cursors[known], page_size)
+if page_rows:
+    cursors[known + 1] = page_cursor(page_rows)
 
 # --------------------------- Display Notifications ---------------------------
-for idx, row in df_page.iterrows():
+for idx, row in enumerate(page_rows, start=(page_num - 1) * page_size):
     st.markdown(f"### {idx+1}. {row['subject']} on {row['day']} at {row['time']}")
     st.markdown(f"""
     - 📘 **Division**: {row.get('division')}
@@ -73,7 +88,8 @@ for idx, row in df_page.iterrows():
     # Undo only for faculty
     if role == "faculty":
         if st.button("↩️ Undo Notification", key=f"undo_{idx}"):
-            supabase.table("notifications").delete().eq("timestamp", row["timestamp"]).eq("username", username).execute()
+            delete_notification(row)
+            st.session_state.history_filter_key = None  # page boundaries moved
             st.success("Notification undone.")
             st.rerun()
     
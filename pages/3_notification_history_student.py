@@ -1,10 +1,20 @@
 import streamlit as st
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from supabase_setup import init_supabase
+from query_metrics import instrument_page
+from auth import restore_session
+from timetable_store import get_user_timetable
+from notification_store import (
+    INBOX_DAYS, INBOX_RECENT_PAGE_SIZE, delete_group, fetch_inbox, fetch_report_week, fetch_report_weeks,
+    insert_notification, respond_to_group, week_start
+)
+from time_slots import slot_order
 
 st.set_page_config(page_title="Notification Student History", layout="wide")
 
 supabase = init_supabase()
+restore_session(st.session_state, st.context.cookies)
+instrument_page("notification_history_student", st.session_state)
 
 st.title("Notification: Faculty Not Present")
 
@@ -20,7 +30,7 @@ if user["role"] == "student":
     st.header("📩 Inform Faculty Absence")
 
     # Load Timetable entries for student's division
-    timetable_data = supabase.table("timetable").select("*").eq("division", user["division"]).execute().data
+    timetable_data = get_user_timetable(user)
 
     if not timetable_data:
         st.warning("No timetable found for your division.")
@@ -50,7 +60,7 @@ if user["role"] == "student":
             entry["time"]
             for entry in timetable_data
             if entry["subject"] == subject and entry["faculty"] == faculty_email and entry["day"] == selected_day
-        ))
+        ), key=slot_order)
         time_slot = st.selectbox("🕒 Select Time Slot", ["Select time"] + time_slots if time_slots else ["No slot available"])
     else:
         time_slot = None
@@ -71,104 +81,115 @@ if user["role"] == "student":
                 "message": "Reported faculty absence",
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             }
-            supabase.table("notifications").insert(new_note).execute()
+            insert_notification(new_note)
             st.success("📬 Report submitted successfully!")
 
     # ---------------- View Sent Notifications ----------------
     st.markdown("---")
     st.subheader("📚 Your Sent Notifications")
 
-    student_notes = supabase.table("notifications").select("*") \
-        .eq("username", user["username"]).eq("role", "student") \
-        .order("date").execute().data
+    weeks = fetch_report_weeks(user["username"])
 
-    if not student_notes:
+    def show_notes(notes):
+        for idx, n in enumerate(notes, 1):
+            st.markdown(f"**{idx}. {n['subject']} | {n['day']} | {n['time']} | {n['faculty'][:3]} | {n['date']}**")
+            st.markdown(f"Message: {n['message']}")
+            if isinstance(n.get("response"), dict) and "message" in n["response"]:
+                st.success(f"Faculty Response: {n['response']['message']}")
+            else:
+                st.info("Awaiting faculty response...")
+
+    def week_label(week):
+        start = date.fromisoformat(week["week_start"])
+        end = start + timedelta(days=6)
+        return f"Week {start.isocalendar()[1]}, {start:%d %b} – {end:%d %b %Y}"
+
+    if not weeks:
         st.info("You haven't submitted any reports yet.")
     else:
-        for n in student_notes:
-            n["date_obj"] = datetime.strptime(n["date"], "%Y-%m-%d")
-
-        student_notes.sort(key=lambda x: x["date_obj"])
-        first_date = student_notes[0]["date_obj"]
-        base_week_start = first_date - timedelta(days=first_date.weekday())
-        grouped_weeks = {}
-
-        for note in student_notes:
-            week_index = ((note["date_obj"] - base_week_start).days) // 7 + 1
-            grouped_weeks.setdefault(week_index, []).append(note)
-
-        today = datetime.today()
-        current_week_index = ((today - base_week_start).days) // 7 + 1
-
-        if current_week_index in grouped_weeks:
-            st.markdown(f"### 📅 Current Week (Week {current_week_index})")
-            for idx, n in enumerate(grouped_weeks[current_week_index], 1):
-                st.markdown(f"**{idx}. {n['subject']} | {n['day']} | {n['time']} | {n['faculty'][:3]} | {n['date']}**")
-                st.markdown(f"Message: {n['message']}")
-                if isinstance(n.get("response"), dict) and "message" in n["response"]:
-                    st.success(f"Faculty Response: {n['response']['message']}")
-                else:
-                    st.info("Awaiting faculty response...")
-
-        for week_num in sorted(grouped_weeks):
-            if week_num == current_week_index:
+        current_week = str(week_start(date.today()))
+        for week in weeks:
+            counts = f"{week['reports']} report(s), {week['answered']} answered"
+            if week["week_start"] == current_week:
+                st.markdown(f"### 📅 Current Week ({week_label(week)})")
+                st.caption(counts)
+                show_notes(fetch_report_week(user["username"], week["week_start"]))
                 continue
-            with st.expander(f"📦 Week {week_num}"):
-                for idx, n in enumerate(grouped_weeks[week_num], 1):
-                    st.markdown(f"**{idx}. {n['subject']} | {n['day']} | {n['time']} | {n['faculty'][:3]} | {n['date']}**")
-                    st.markdown(f"Message: {n['message']}")
-                    if isinstance(n.get("response"), dict) and "message" in n["response"]:
-                        st.success(f"Faculty Response: {n['response']['message']}")
-                    else:
-                        st.info("Awaiting faculty response...")
+            # Older weeks are read only while their expander is open.
+            with st.expander(f"📦 {week_label(week)} · {counts}", key=f"report_week_{week['week_start']}",
+                             on_change="rerun") as box:
+                if box.open:
+                    show_notes(fetch_report_week(user["username"], week["week_start"]))
 
 # ---------------- Faculty View ----------------
 elif user["role"] == "faculty":
     st.header("Student Notifications")
 
-    notes = supabase.table("notifications").select("*") \
-        .eq("role", "student").eq("faculty", user["username"]).execute().data
-
-    if not notes:
-        st.info("No student notifications found.")
+    PRESETS = ["", "I'm coming", "I'm unavailable", "Contact Class Coordinator"]
+    window_start = (datetime.today() - timedelta(days=INBOX_DAYS)).strftime("%Y-%m-%d")
+
+    def show_group(g):
+        key = f"{g['date']}|{g['time']}|{g['subject']}|{g['division']}"
+        reported = f"{g['reports']} students reported" if g["reports"] > 1 else "1 student reported"
+        st.markdown(f"**{g['subject']} | {g['date']} | {g['time']} | Division {g['division']}** · {reported}")
+        st.caption(f"Reported by: {g['reporters']}")
+
+        if not g["pending"]:
+            st.info(f"You responded: {g['response_message']}")
+        else:
+            if g["pending"] < g["reports"]:
+                st.info(f"You responded: {g['response_message']} ({g['pending']} newer report(s) pending)")
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                preset_choice = st.selectbox("📋 Choose Response (or leave empty)", PRESETS, key=f"preset_{key}")
+                custom_msg = st.text_input(" Or Type Custom Response", key=f"custom_input_{key}")
+
+            with col2:
+                label = "✅ Send Response" if g["pending"] == 1 else f"✅ Send to all {g['pending']}"
+                if st.button(label, key=f"send_{key}"):
+                    final_msg = custom_msg.strip() if custom_msg.strip() else preset_choice.strip()
+
+                    if not final_msg:
+                        st.warning("Please choose a preset or type a custom message before sending.")
+                    else:
+                        respond_to_group(g, {"by": user["username"], "message": final_msg})
+                        st.success("📨 Response sent successfully!")
+                        st.rerun()
+
+            # Only reports still awaiting a reply can be deleted; answered
+            # ones stay on record.
+            if st.button("🗑️ Delete", key=f"delete_{key}"):
+                delete_group(g)
+                st.rerun()
+        st.markdown("---")
+
+    def show_pages(pages, empty_message, **window):
+        # The first pages of one window, newest first; returns whether more follow.
+        more = False
+        for page in range(pages):
+            groups, more = fetch_inbox(user["username"], page=page, **window)
+            if page == 0 and not groups:
+                st.info(empty_message)
+            for g in groups:
+                show_group(g)
+        return more
+
+    # Both windows load a page at a time, only when asked for. Older reports
+    # are offered once the recent window has been shown to its end, so each
+    # click continues from the last class on screen.
+    st.caption(f"Reports from the last {INBOX_DAYS} days, grouped by class.")
+    recent_pages = st.session_state.get("inbox_recent_pages", 1)
+    if show_pages(recent_pages, "No student notifications in this period.",
+                  start_date=window_start, page_size=INBOX_RECENT_PAGE_SIZE):
+        if st.button("⬇️ Load more reports"):
+            st.session_state.inbox_recent_pages = recent_pages + 1
+            st.rerun()
     else:
-        for idx, n in enumerate(reversed(notes), 1):
-            st.markdown(f"**{idx}. {n['subject']} | {n['date']} | {n['time']} | Student: {n['username']}**")
-            st.markdown(f"Message: {n['message']}")
-
-            response_data = n.get("response")
-            if isinstance(response_data, dict) and "message" in response_data:
-                st.info(f"You responded: {response_data['message']}")
-            else:
-                col1, col2 = st.columns([2, 1])
-
-                with col1:
-                    preset_choice = st.selectbox(
-                        f"📋 Choose Response (or leave empty)",
-                        ["", "I'm coming", "I'm unavailable", "Contact Class Coordinator"],
-                        key=f"preset_{idx}"
-                    )
-                    custom_msg = st.text_input(
-                        " Or Type Custom Response",
-                        key=f"custom_input_{idx}"
-                    )
-
-                with col2:
-                    if st.button("✅ Send Response", key=f"send_{idx}"):
-                        final_msg = custom_msg.strip() if custom_msg.strip() else preset_choice.strip()
-
-                        if not final_msg:
-                            st.warning("Please choose a preset or type a custom message before sending.")
-                        else:
-                            supabase.table("notifications").update({
-                                "response": {"by": user["username"], "message": final_msg}
-                            }).eq("timestamp", n["timestamp"]).execute()
-                            st.success("📨 Response sent successfully!")
-                            st.rerun()
-
-                # Optional Delete Button
-                if st.button("🗑️ Delete", key=f"delete_{idx}"):
-                    supabase.table("notifications").delete().eq("timestamp", n["timestamp"]).execute()
-                    st.rerun()
+        older_pages = st.session_state.get("inbox_older_pages", 0)
+        more_older = show_pages(older_pages, "No older student notifications.", end_date=window_start)
+        if (more_older or not older_pages) and st.button("⬇️ Load older reports"):
+            st.session_state.inbox_older_pages = older_pages + 1
+            st.rerun()
 else:
     st.warning("This page is restricted to students and faculty.")
@@ -1,8 +1,17 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from calendar import monthrange
 from supabase_setup import init_supabase
+from query_metrics import instrument_page
+from auth import restore_session
+from timetable_store import query_timetable
+from report_engine import build_status_summary, build_term_cube, slice_cube, term_pivot
+from notification_store import faculty_partition, scan_notifications
+from rollup_store import fetch_rollup, month_range
+from export_pipeline import FORMATS, export_notifications, notification_filters
+from parallel_reads import fetch_parallel
+from shared_cache import cached
+import os
 import plotly.express as px
 import io
 
@@ -10,6 +19,8 @@ st.set_page_config(page_title="📊 Monthly Report", layout="wide")
 
 # -------------------- Initialize Supabase --------------------
 supabase = init_supabase()
+restore_session(st.session_state, st.context.cookies)
+instrument_page("monthly_report", st.session_state)
 
 # -------------------- Authentication --------------------
 if "user" not in st.session_state or st.session_state.user is None:
@@ -22,9 +33,101 @@ role = user.get("role")
 
 st.title("📊 Monthly Class Report")
 
+def semester_start(today):
+    return today.replace(day=1, month=1 if today.month < 7 else 7)
+
+# -------------------- Semester Export --------------------
+# Streams notifications from the database page by page into a file, so the
+# export size (all divisions, a whole semester) never has to fit in memory.
+def render_semester_export(scope, divisions=None, key_prefix="export"):
+    today = datetime.now().date()
+    col1, col2, col3 = st.columns(3)
+    start = col1.date_input("From", value=semester_start(today), key=f"{key_prefix}_from")
+    end = col2.date_input("To", value=today, key=f"{key_prefix}_to")
+    fmt = col3.selectbox("Format", list(FORMATS), key=f"{key_prefix}_format")
+    selected = st.multiselect("Divisions (empty = all)", divisions, key=f"{key_prefix}_divisions") if divisions else None
+
+    if st.button("📦 Prepare export", key=f"{key_prefix}_run"):
+        progress = st.progress(0.0, text="Starting export...")
+
+        def report(done, total):
+            progress.progress(min(1.0, done / total) if total else 1.0, text=f"{done} / {total} rows written")
+
+        try:
+            path, written = export_notifications(
+                fmt, notification_filters(start, end, divisions=selected, **scope), progress=report
+            )
+        except ValueError as e:
+            st.error(str(e))
+            return
+
+        with open(path, "rb") as f:
+            st.download_button(
+                label=f"📥 Download {written} rows (.{fmt})",
+                data=f,
+                file_name=f"notifications_{start}_{end}.{fmt}",
+                mime=FORMATS[fmt],
+                key=f"{key_prefix}_download"
+            )
+        os.remove(path)
+
+# -------------------- Term Overview --------------------
+# The whole term is fetched once and aggregated in one pass; the cube is
+# shared across sessions and only rebuilt when this faculty member's
+# notifications change (any change, for the department cube) or the cache
+# TTL expires. Switching division or month just slices it.
+def load_term_cube(start, end, faculty):
+    with st.spinner("Loading the term..."):
+        return cached(
+            "notifications", ("term_cube", start, end, faculty),
+            lambda: build_term_cube(scan_notifications(start, end, faculty)),
+            partitions=[faculty_partition(faculty)] if faculty else None
+        )
+
+def render_term_overview(faculty=None, key_prefix="term"):
+    today = datetime.now().date()
+    col1, col2 = st.columns(2)
+    start = col1.date_input("Term starts", value=semester_start(today), key=f"{key_prefix}_from")
+    end = col2.date_input("Term ends", value=today, key=f"{key_prefix}_to")
+
+    cube = load_term_cube(str(start), str(end), faculty)
+    if cube.empty:
+        st.info("No class notifications available for this term.")
+        return
+
+    st.markdown("#### Divisions × Months")
+    st.dataframe(term_pivot(cube), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    division = col1.selectbox("Division", ["All"] + sorted(cube["division"].unique()), key=f"{key_prefix}_division")
+    month = col2.selectbox("Month", ["All"] + sorted(cube["year_month"].unique()), key=f"{key_prefix}_month")
+    df_slice = slice_cube(cube, None if division == "All" else division, None if month == "All" else month)
+
+    fig = px.bar(
+        df_slice, x="subject", y="Count", color="status", barmode="stack", text_auto=True,
+        title=f"📊 Term Report - Division {division} · Month {month}"
+    )
+    fig.update_layout(yaxis_title="Total Classes (per status)", xaxis_title="Subject", legend_title="Class Status", height=500)
+    st.plotly_chart(fig, use_container_width=True)
+
+if role == "admin":
+    st.subheader("🗓️ Department Term Overview")
+    render_term_overview()
+    st.markdown("---")
+    st.subheader("📦 Department-wide Export")
+    render_semester_export({}, divisions=sorted(set(e["division"] for e in query_timetable(columns="division") if e.get("division"))))
+    st.stop()
+
+if st.toggle("📦 Export a whole semester (all your divisions)"):
+    render_semester_export({"faculty": username})
+    st.markdown("---")
+
+if st.radio("Report", ["📊 Monthly", "🗓️ Term overview"], horizontal=True) == "🗓️ Term overview":
+    render_term_overview(username)
+    st.stop()
+
 # -------------------- Fetch Faculty's Timetable --------------------
-timetable_resp = supabase.table("timetable").select("*").eq("faculty", username).execute()
-timetable = timetable_resp.data if timetable_resp.data else []
+timetable = query_timetable(faculty=username, columns="division, subject")
 
 division_subject_map = {}
 for entry in timetable:
@@ -48,86 +151,17 @@ current_year = datetime.now().year
 year = st.selectbox("Select Year", list(range(2025, current_year + 1)), index=0)
 
 # -------------------- Safe Date Range --------------------
-month_str = str(month).zfill(2)
-last_day = monthrange(year, month)[1]
-start_date = f"{year}-{month_str}-01"
-end_date = f"{year}-{month_str}-{str(last_day).zfill(2)}"
-
-# -------------------- Fetch Notifications --------------------
-faculty_noti = supabase.table("notifications").select("*")\
-    .eq("role", "faculty")\
-    .eq("username", username)\
-    .eq("division", selected_division)\
-    .in_("subject", assigned_subjects)\
-    .gte("date", start_date).lte("date", end_date).execute().data
-
-student_noti = supabase.table("notifications").select("*")\
-    .eq("role", "student")\
-    .eq("division", selected_division)\
-    .in_("subject", assigned_subjects)\
-    .gte("date", start_date).lte("date", end_date).execute().data
-
-# -------------------- Convert to DataFrames --------------------
-df_fac = pd.DataFrame(faculty_noti)
-df_stu = pd.DataFrame(student_noti)
-
-# -------------------- Clean and Validate --------------------
-for df in [df_fac, df_stu]:
-    for col in ["date", "time", "subject", "status", "username", "division", "response"]:
-        if col not in df.columns:
-            df[col] = None
+year_month = f"{year}-{str(month).zfill(2)}"
+start_date, end_date = month_range(year_month)
 
-    if not df.empty:
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
-        df.dropna(subset=["date"], inplace=True)
-        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+# -------------------- Fetch Pre-Aggregated Counts --------------------
+rollup = fetch_rollup(username, selected_division, year_month, assigned_subjects)
 
-# -------------------- Prepare Faculty Not Present --------------------
-faculty_not_present = []
-if not df_stu.empty:
-    grouped = df_stu.groupby(["date", "time", "subject"])
-    for (date, time, subject), group in grouped:
-        fac_match = df_fac[
-            (df_fac["date"] == date) &
-            (df_fac["time"] == time) &
-            (df_fac["subject"] == subject)
-        ]
-        if fac_match.empty or fac_match.iloc[0].get("response", "").strip().lower() == "i'm unavailable":
-            faculty_not_present.append({
-                "subject": subject,
-                "status": "Faculty Not Present",
-                "username": username,
-                "division": selected_division,
-                "date": date
-            })
-
-# -------------------- Combine All --------------------
-status_records = []
-
-if not df_fac.empty:
-    for _, row in df_fac.iterrows():
-        status_records.append({
-            "subject": row.get("subject", "Unknown"),
-            "status": row.get("status", "Unknown"),
-            "username": row.get("username", "N/A"),
-            "division": row.get("division", selected_division),
-            "date": row.get("date", "")
-        })
-
-status_records.extend(faculty_not_present)
-
-if not status_records:
+if not rollup:
     st.info("No class notifications available for this month and division.")
     st.stop()
 
-df_summary = pd.DataFrame(status_records)
-
-# -------------------- Debug Summary --------------------
-with st.expander("📂 Debug: Summary Data"):
-    st.dataframe(df_summary)
-
-# -------------------- Aggregate --------------------
-df_agg = df_summary.groupby(["subject", "status"]).size().reset_index(name="Count")
+df_agg = pd.DataFrame(rollup).rename(columns={"count": "Count"})
 
 # -------------------- Plot --------------------
 fig = px.bar(
@@ -148,6 +182,52 @@ fig.update_layout(
 
 st.plotly_chart(fig, use_container_width=True)
 
+# -------------------- Detailed Records --------------------
+# The chart only needs the rollup; raw notifications are fetched only when
+# the faculty member asks for the detailed rows.
+if not st.checkbox("📂 Load detailed records (debug view and Excel export)"):
+    st.stop()
+
+def detail_query(role, person_column):
+    return supabase.table("notifications").select("*")\
+        .eq("role", role)\
+        .eq(person_column, username)\
+        .eq("division", selected_division)\
+        .in_("subject", assigned_subjects)\
+        .gte("date", start_date).lte("date", end_date)
+
+# Both reads are independent, so they run side by side
+details, failed = fetch_parallel({
+    "faculty": lambda: detail_query("faculty", "username").execute().data,
+    "student": lambda: detail_query("student", "faculty").execute().data,
+})
+for name, error in failed.items():
+    st.warning(f"⚠️ Could not load {name} notifications, so the summary is incomplete: {error}")
+faculty_noti = details.get("faculty") or []
+student_noti = details.get("student") or []
+
+# -------------------- Convert to DataFrames --------------------
+df_fac = pd.DataFrame(faculty_noti)
+df_stu = pd.DataFrame(student_noti)
+
+# -------------------- Clean and Validate --------------------
+for df in [df_fac, df_stu]:
+    for col in ["date", "time", "subject", "status", "username", "division", "response"]:
+        if col not in df.columns:
+            df[col] = None
+
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df.dropna(subset=["date"], inplace=True)
+        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+
+# -------------------- Combine Faculty Records & Faculty Not Present --------------------
+df_summary = build_status_summary(df_fac, df_stu, username, selected_division)
+
+# -------------------- Debug Summary --------------------
+with st.expander("📂 Debug: Summary Data"):
+    st.dataframe(df_summary)
+
 # -------------------- Excel Export --------------------
 def convert_df_to_excel(df):
     output = io.BytesIO()
@@ -1,10 +1,18 @@
 import streamlit as st
 from supabase_setup import init_supabase
-import ast
+from query_metrics import instrument_page
+from auth import restore_session
+from user_store import (
+    FACULTY_PAGE_SIZE, apply_import, create_faculty, delete_faculty, faculty_csv, plan_import, read_import,
+    reload_users, search_faculty, update_faculty
+)
+import math
 
 st.set_page_config(page_title="Admin Panel", layout="wide")
 
 supabase = init_supabase()
+restore_session(st.session_state, st.context.cookies)
+instrument_page("admin_panel", st.session_state)
 
 # -------------------- Auth Check --------------------
 user = st.session_state.get("user")
@@ -14,69 +22,116 @@ if not user or user.get("role") != "admin":
 
 st.title("🛠️ Admin Panel - Faculty Management")
 
-# -------------------- Load Faculty Users --------------------
-@st.cache_data(ttl=30)
-def get_faculty_users():
-    result = supabase.table("users").select("*").eq("role", "faculty").execute()
-    return result.data if result.data else []
-
-faculty_users = get_faculty_users()
-
 # -------------------- Handle Success Messages --------------------
 if "status_message" in st.session_state:
     st.success(st.session_state.status_message)
     del st.session_state["status_message"]
 
+# -------------------- Login Cache --------------------
+if st.sidebar.button("🔄 Reload login cache", help="Forget cached logins, sessions and user lists, e.g. after editing users in the database directly."):
+    reload_users()
+    st.sidebar.success("Login cache cleared.")
+
 # -------------------- Show & Edit Faculty Users --------------------
 st.subheader("👨‍🏫 Existing Faculty Users")
 
-for idx, user in enumerate(faculty_users):
-    with st.expander(user["username"]):
-        st.write(f"**Subjects**: {', '.join(user.get('subjects', []))}")
-        st.write(f"**Divisions**: {', '.join(user.get('divisions', []))}")
-
-        new_subjects = st.text_input("Edit Subjects", ", ".join(user.get("subjects", [])), key=f"sub_{idx}")
-        new_divisions = st.text_input("Edit Divisions", ", ".join(user.get("divisions", [])), key=f"div_{idx}")
-        new_password = st.text_input("Edit Password", user["password"], type="password", key=f"pwd_{idx}")
-
-        if st.button(f"💾 Update {user['username']}", key=f"update_{idx}"):
-            supabase.table("users").update({
-                "subjects": [s.strip() for s in new_subjects.split(",") if s.strip()],
-                "divisions": [d.strip() for d in new_divisions.split(",") if d.strip()],
-                "password": new_password
-            }).eq("username", user["username"]).execute()
-            st.session_state.status_message = f"✅ Updated {user['username']}"
-            st.cache_data.clear()
-            st.rerun()
+search = st.text_input("🔍 Search by username", key="faculty_search")
+_, total = search_faculty(search, 0)
+pages = max(1, math.ceil(total / FACULTY_PAGE_SIZE))
+col1, col2 = st.columns([1, 3])
+# Keyed by the search text so a new search starts again at page 1
+page = col1.number_input("Page", min_value=1, max_value=pages, value=1, key=f"faculty_page_{search}")
+faculty_users, total = search_faculty(search, page - 1)
+col2.caption(f"{total} faculty found · page {page} of {pages}")
 
-        if st.button(f"🗑️ Delete {user['username']}", key=f"delete_{idx}"):
-            supabase.table("users").delete().eq("username", user["username"]).execute()
-            st.session_state.status_message = f"✅ Deleted {user['username']}"
-            st.cache_data.clear()
+if not faculty_users:
+    st.info("No faculty match this search.")
+else:
+    st.dataframe(
+        [{
+            "Username": u["username"],
+            "Subjects": ", ".join(u.get("subjects") or []),
+            "Divisions": ", ".join(u.get("divisions") or []),
+        } for u in faculty_users],
+        use_container_width=True,
+        hide_index=True
+    )
+
+    selected = st.selectbox("✏️ Edit faculty", [u["username"] for u in faculty_users])
+    user = next(u for u in faculty_users if u["username"] == selected)
+
+    with st.form(f"edit_{selected}"):
+        new_subjects = st.text_input("Edit Subjects", ", ".join(user.get("subjects") or []))
+        new_divisions = st.text_input("Edit Divisions", ", ".join(user.get("divisions") or []))
+        new_password = st.text_input("New Password (leave blank to keep)", type="password")
+
+        if st.form_submit_button(f"💾 Update {selected}"):
+            update_faculty(selected, new_subjects, new_divisions, new_password)
+            st.session_state.status_message = f"✅ Updated {selected}"
             st.rerun()
 
+    if st.button(f"🗑️ Delete {selected}", key=f"delete_{selected}"):
+        delete_faculty(selected)
+        st.session_state.status_message = f"✅ Deleted {selected}"
+        st.rerun()
+
 # -------------------- Add New Faculty --------------------
 st.markdown("---")
 st.subheader("➕ Add New Faculty")
 
-new_username = st.text_input("Username (email)", key="new_username")
-new_password = st.text_input("Password", key="new_password")
-new_subjects = st.text_input("Subjects (comma-separated)", key="new_subjects")
-new_divisions = st.text_input("Divisions (comma-separated)", key="new_divisions")
+with st.form("new_faculty", clear_on_submit=True):
+    new_username = st.text_input("Username (email)")
+    new_password = st.text_input("Password")
+    new_subjects = st.text_input("Subjects (comma-separated)")
+    new_divisions = st.text_input("Divisions (comma-separated)")
+
+    if st.form_submit_button("➕ Create Faculty"):
+        try:
+            create_faculty(new_username, new_password, new_subjects, new_divisions)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+        else:
+            st.session_state.status_message = "✅ New faculty added successfully."
+            st.rerun()
+
+# -------------------- Bulk Import --------------------
+st.markdown("---")
+st.subheader("📤 Bulk Import / Edit Faculty")
+st.caption(
+    "Upload a CSV or Excel file with the columns username, password, subjects, divisions. "
+    "New usernames are added; existing faculty are updated. A blank password keeps the current one."
+)
+
+if st.button("📄 Prepare current faculty as CSV"):
+    st.session_state.faculty_csv = faculty_csv()
+if "faculty_csv" in st.session_state:
+    st.download_button("📥 Download faculty.csv", st.session_state.faculty_csv, "faculty.csv", "text/csv")
 
-if st.button("➕ Create Faculty"):
-    exists = supabase.table("users").select("username").eq("username", new_username).execute()
-    if exists.data:
-        st.error("⚠️ A user with this username already exists.")
+uploaded = st.file_uploader("Faculty file", type=["csv", "xlsx"])
+if uploaded is not None:
+    try:
+        plan = plan_import(read_import(uploaded.name, uploaded.getvalue()))
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        st.stop()
+
+    if plan["errors"]:
+        st.error(f"⚠️ {len(plan['errors'])} rows need fixing before anything is imported.")
+        st.dataframe([{"Line": line, "Problem": message} for line, message in plan["errors"]], hide_index=True)
     else:
-        new_user = {
-            "username": new_username,
-            "password": new_password,
-            "role": "faculty",
-            "subjects": [s.strip() for s in new_subjects.split(",") if s.strip()],
-            "divisions": [d.strip() for d in new_divisions.split(",") if d.strip()]
-        }
-        supabase.table("users").insert(new_user).execute()
-        st.session_state.status_message = "✅ New faculty added successfully."
-        st.cache_data.clear()
-        st.rerun()
+        st.write(f"**New**: {len(plan['inserted'])} · **Changed**: {len(plan['updated'])} · **Unchanged**: {plan['unchanged']}")
+        if plan["rows"]:
+            st.dataframe(
+                [{
+                    "Username": row["username"],
+                    "Action": "add" if row["username"] in plan["inserted"] else "update",
+                    "Subjects": ", ".join(row["subjects"]),
+                    "Divisions": ", ".join(row["divisions"]),
+                } for row in plan["rows"]],
+                use_container_width=True,
+                hide_index=True
+            )
+            if st.button(f"✅ Apply {len(plan['rows'])} changes"):
+                apply_import(plan)
+                st.session_state.status_message = f"✅ Imported {len(plan['inserted'])} new and {len(plan['updated'])} updated faculty."
+                st.rerun()
@@ -0,0 +1,70 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+# Shared by every session of the app process; reads beyond this many wait
+# for a free worker. The wait does not count towards a read's timeout.
+READ_WORKERS = int(os.getenv("PARALLEL_READ_WORKERS", "8"))
+READ_TIMEOUT = float(os.getenv("PARALLEL_READ_TIMEOUT", "10"))
+
+_pool = ThreadPoolExecutor(max_workers=READ_WORKERS, thread_name_prefix="parallel-read")
+
+
+class ReadTimeout(TimeoutError):
+    pass
+
+
+class _Read:
+    # One submitted read; notes when a worker actually picks it up.
+    def __init__(self, read, limit):
+        self.read = read
+        self.limit = limit
+        # Each read runs in a copy of the caller's context, so query_metrics
+        # still attributes its queries to the page render that asked for it.
+        self.context = contextvars.copy_context()
+        self.started = threading.Event()
+        self.started_at = None
+        self.future = None
+
+    def __call__(self):
+        self.started_at = time.monotonic()
+        self.started.set()
+        return self.context.run(self.read)
+
+
+def fetch_parallel(reads, timeout=READ_TIMEOUT):
+    # reads maps a name to a zero-argument callable, or to (callable, timeout)
+    # for a read with its own limit. All reads are submitted at once; the call
+    # returns when each has finished or run out of time, so it takes as long
+    # as the slowest read rather than the sum of them.
+    #
+    # A read's limit runs from when a worker starts it. A read still queued
+    # after its limit (the pool is busy with other sessions) is taken back
+    # and run on the calling thread instead.
+    #
+    # Returns (results, errors): a failed or timed-out read lands in errors
+    # under its name and never affects the others. A started read cannot be
+    # stopped, so one that times out keeps its worker until it finishes; its
+    # result is discarded.
+    jobs = {}
+    for name, read in reads.items():
+        read, limit = read if isinstance(read, tuple) else (read, timeout)
+        job = _Read(read, limit)
+        job.future = _pool.submit(job)
+        jobs[name] = job
+
+    results, errors = {}, {}
+    for name, job in jobs.items():
+        try:
+            if not job.started.wait(job.limit) and job.future.cancel():
+                results[name] = job.read()
+                continue
+            job.started.wait()
+            results[name] = job.future.result(timeout=max(0.0, job.started_at + job.limit - time.monotonic()))
+        except TimeoutError:
+            errors[name] = ReadTimeout(f"'{name}' did not finish within {job.limit:g}s")
+        except Exception as e:
+            errors[name] = e
+    return results, errors
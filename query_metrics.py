@@ -0,0 +1,220 @@
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from shared_cache import cache_stats
+
+# Optional JSON-lines log of every query, e.g. QUERY_LOG_PATH=queries.jsonl
+QUERY_LOG_PATH = os.getenv("QUERY_LOG_PATH")
+RENDER_HISTORY = int(os.getenv("QUERY_METRICS_HISTORY", "500"))
+
+_current_render = contextvars.ContextVar("current_render", default=None)
+_renders = deque(maxlen=RENDER_HISTORY)
+_renders_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+# ---------------------- Render Recorder ----------------------
+class PageRender:
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self.queries = []
+
+    def record(self, entry):
+        self.queries.append(entry)
+
+    def totals(self):
+        return {
+            "page": self.page,
+            "started_at": self.started_at,
+            "queries": len(self.queries),
+            "rows": sum(q["rows"] for q in self.queries),
+            "bytes": sum(q["bytes"] for q in self.queries),
+            "db_ms": round(sum(q["ms"] for q in self.queries), 1),
+            "errors": sum(1 for q in self.queries if q["error"]),
+        }
+
+
+def begin_render(page):
+    render = PageRender(page)
+    _current_render.set(render)
+    with _renders_lock:
+        _renders.append(render)
+    return render
+
+
+def current_render():
+    return _current_render.get()
+
+
+def recent_renders(page=None):
+    with _renders_lock:
+        renders = list(_renders)
+    return [r for r in renders if page is None or r.page == page]
+
+
+def _write_log(entry):
+    with _log_lock:
+        with open(QUERY_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+
+def _payload_bytes(data):
+    if data is None:
+        return 0
+    return len(json.dumps(data, default=str).encode("utf-8"))
+
+
+def _describe(name, args, kwargs):
+    if name in ("insert", "upsert") and args:
+        rows = args[0] if isinstance(args[0], list) else [args[0]]
+        shown = [f"{len(rows)} rows"]
+    elif name == "update" and args:
+        shown = [",".join(args[0])]
+    else:
+        shown = [repr(a) if not isinstance(a, str) else a for a in args]
+    shown += [f"{k}={v}" for k, v in kwargs.items() if k != "json"]
+    text = f"{name}({', '.join(shown)})"
+    return text if len(text) <= 200 else text[:197] + "..."
+
+
+# ---------------------- Client Wrapper ----------------------
+class InstrumentedQuery:
+    def __init__(self, builder, table):
+        self._builder = builder
+        self._table = table
+        self._action = None
+        self._calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                if self._action is None and name in ("select", "insert", "upsert", "update", "delete", "rpc"):
+                    self._action = name
+                self._calls.append(_describe(name, args, kwargs))
+                self._builder = result
+                return self
+            return result
+        return call
+
+    def execute(self):
+        start = time.perf_counter()
+        error = None
+        response = None
+        try:
+            response = self._builder.execute()
+            return response
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            data = getattr(response, "data", None)
+            render = current_render()
+            entry = {
+                "page": render.page if render else None,
+                "table": self._table,
+                "action": self._action or "select",
+                "filters": [c for c in self._calls if not c.startswith(("select(", "insert(", "upsert(", "update(", "delete("))],
+                "rows": len(data) if isinstance(data, list) else (1 if data else 0),
+                "count": getattr(response, "count", None),
+                "bytes": _payload_bytes(data),
+                "ms": round(elapsed, 2),
+                "error": error,
+            }
+            if render:
+                render.record(entry)
+            if QUERY_LOG_PATH:
+                _write_log({"at": datetime.now(timezone.utc).isoformat(), **entry})
+
+
+class InstrumentedClient:
+    def __init__(self, client):
+        self._client = client
+
+    def table(self, table_name):
+        return InstrumentedQuery(self._client.table(table_name), table_name)
+
+    def from_(self, table_name):
+        return self.table(table_name)
+
+    def rpc(self, fn, params=None, *args, **kwargs):
+        query = InstrumentedQuery(self._client.rpc(fn, params or {}, *args, **kwargs), f"rpc:{fn}")
+        query._action = "rpc"
+        return query
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+# ---------------------- Admin Panel ----------------------
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def page_summary():
+    summary = {}
+    for render in recent_renders():
+        totals = render.totals()
+        summary.setdefault(render.page, []).append(totals)
+    rows = []
+    for page, renders in sorted(summary.items()):
+        db_ms = [r["db_ms"] for r in renders]
+        rows.append({
+            "page": page,
+            "renders": len(renders),
+            "avg queries": round(sum(r["queries"] for r in renders) / len(renders), 1),
+            "avg db ms": round(sum(db_ms) / len(db_ms), 1),
+            "p95 db ms": _percentile(db_ms, 95),
+            "avg KB": round(sum(r["bytes"] for r in renders) / len(renders) / 1024, 1),
+            "errors": sum(r["errors"] for r in renders),
+        })
+    return rows
+
+
+def instrument_page(page, state):
+    # Starts recording this render. Admins get a sidebar panel with the
+    # previous complete render of the page in this session and process-wide
+    # per-page aggregates (a render's own totals are only final once it ends).
+    previous = state.get("perf_last_render", {}).get(page)
+    render = begin_render(page)
+    state.setdefault("perf_last_render", {})[page] = render
+
+    user = state.get("user")
+    if not user or user.get("role") != "admin":
+        return render
+
+    import streamlit as st
+    with st.sidebar.expander("⏱️ Performance"):
+        if previous is not None:
+            totals = previous.totals()
+            st.markdown(
+                f"**Previous render**: {totals['queries']} queries · {totals['rows']} rows · "
+                f"{totals['bytes'] / 1024:.1f} KB · {totals['db_ms']} ms in DB"
+            )
+            if previous.queries:
+                st.dataframe(
+                    [{k: q[k] for k in ("table", "action", "filters", "rows", "bytes", "ms")} for q in previous.queries],
+                    use_container_width=True
+                )
+        st.markdown("**All pages (this server process)**")
+        st.dataframe(page_summary(), use_container_width=True)
+        cache = cache_stats()
+        st.markdown(
+            f"**Shared cache**: {cache['entries']} entries · {cache['bytes'] / 1024 / 1024:.1f} MB · "
+            f"{cache['hit_rate']:.0%} hits · {cache['evictions']} evictions"
+        )
+    return render
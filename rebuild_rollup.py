@@ -0,0 +1,14 @@
+import argparse
+from rollup_store import rebuild_rollup
+
+parser = argparse.ArgumentParser(description="Rebuild the monthly report rollup from the notifications table.")
+parser.add_argument("--from-month", help="First month to rebuild (YYYY-MM). Defaults to the earliest notification.")
+parser.add_argument("--to-month", help="Last month to rebuild (YYYY-MM). Defaults to the latest notification.")
+args = parser.parse_args()
+
+summary = rebuild_rollup(args.from_month, args.to_month)
+
+print("\nRollup rebuilt:")
+print(f"  Notifications scanned: {summary['notifications']}")
+print(f"  Rollup rows written  : {summary['rollup_rows']}")
+print(f"  Stale rows zeroed    : {summary['zeroed']}")
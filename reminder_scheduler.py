@@ -0,0 +1,213 @@
+import argparse
+import heapq
+import itertools
+import json
+import logging
+import os
+import queue
+import time
+from datetime import date, datetime, timedelta
+from bulk_sync import DEFAULT_CHUNK_SIZE, chunked, scan_table
+from notification_store import slot_key
+from time_slots import parse_slot
+
+# Reminders go out this long before a class starts; a class with no faculty
+# status this long after it ends is flagged as unmarked.
+REMINDER_LEAD = timedelta(minutes=float(os.getenv("REMINDER_LEAD_MINUTES", "10")))
+UNMARKED_GRACE = timedelta(minutes=float(os.getenv("UNMARKED_GRACE_MINUTES", "15")))
+
+REMINDER = "reminder"
+UNMARKED = "unmarked"
+NEXT_DAY = "next_day"
+
+
+# ---------------------- Sinks ----------------------
+# A sink takes one message dict at a time. Swap in a push service, mailer or
+# message queue by giving it an emit() method.
+class LogSink:
+    def __init__(self, logger=None):
+        self.logger = logger or logging.getLogger("reminders")
+
+    def emit(self, message):
+        self.logger.info(json.dumps(message))
+
+
+class QueueSink:
+    # In-process stand-in for a message queue; consumers read .queue.
+    def __init__(self, maxsize=0):
+        self.queue = queue.Queue(maxsize)
+
+    def emit(self, message):
+        self.queue.put(message)
+
+
+class JsonlSink:
+    def __init__(self, path):
+        self.path = path
+
+    def emit(self, message):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(message) + "\n")
+
+
+def make_sink(spec):
+    # "log" or "jsonl:PATH"
+    kind, _, target = spec.partition(":")
+    if kind == "log":
+        return LogSink()
+    if kind == "jsonl" and target:
+        return JsonlSink(target)
+    raise ValueError(f"Unknown sink '{spec}' (use 'log' or 'jsonl:PATH').")
+
+
+def _message(kind, day, entry, when):
+    return {
+        "kind": kind,
+        "at": when.isoformat(timespec="minutes"),
+        "date": str(day),
+        "day": entry.get("day"),
+        "time": entry.get("time"),
+        "subject": entry.get("subject"),
+        "type": entry.get("type"),
+        "room": entry.get("room"),
+        # Who it is for: the faculty member and the division (or one batch).
+        "faculty": entry.get("faculty"),
+        "division": entry.get("division"),
+        "batch": entry.get("batch"),
+    }
+
+
+# ---------------------- Scheduler ----------------------
+class ReminderScheduler:
+    def __init__(self, rows, sink, lead=REMINDER_LEAD, grace=UNMARKED_GRACE):
+        # The timetable is parsed once into per-weekday lists of (Slot, entry);
+        # a day's plan is built from them without touching the database.
+        self.sink = sink
+        self.lead = lead
+        self.grace = grace
+        self.by_day = {}
+        for row in rows:
+            slot = parse_slot(row.get("time"))
+            if slot:
+                self.by_day.setdefault(row.get("day"), []).append((slot, row))
+        self.heap = []
+        self.sent = {REMINDER: 0, UNMARKED: 0}
+        self._order = itertools.count()
+
+    def _push(self, when, kind, payload):
+        heapq.heappush(self.heap, (when, next(self._order), kind, payload))
+
+    def plan_day(self, day, now=None):
+        # Pushes a reminder and an unmarked check per class (events already
+        # past at now are skipped) plus the event that plans the next day.
+        midnight = datetime.combine(day, datetime.min.time())
+        planned = 0
+        for slot, entry in self.by_day.get(day.strftime("%A"), []):
+            start = midnight + timedelta(minutes=slot.start)
+            end = midnight + timedelta(minutes=slot.end)
+            for when, kind in ((start - self.lead, REMINDER), (end + self.grace, UNMARKED)):
+                if now is None or when >= now:
+                    self._push(when, kind, (day, entry))
+                    planned += 1
+        self._push(midnight + timedelta(days=1), NEXT_DAY, day + timedelta(days=1))
+        return planned
+
+    def next_time(self):
+        return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now):
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        return due
+
+    def handle(self, events):
+        checks = []
+        for when, _, kind, payload in events:
+            if kind == NEXT_DAY:
+                self.plan_day(payload)
+            elif kind == REMINDER:
+                self.sink.emit(_message(REMINDER, payload[0], payload[1], when))
+                self.sent[REMINDER] += 1
+            else:
+                checks.append((when, payload))
+        if checks:
+            self.flag_unmarked(checks)
+
+    def flag_unmarked(self, checks):
+        # All checks due together share one lookup of the faculty statuses
+        # posted that day for just the faculty and time slots involved. It is
+        # paged, so a busy slot can't push real statuses past the row cap and
+        # get their classes flagged.
+        by_date = {}
+        for when, (day, entry) in checks:
+            by_date.setdefault(day, []).append((when, entry))
+        for day, items in by_date.items():
+            faculty = sorted({entry.get("faculty") for _, entry in items if entry.get("faculty")})
+            times = sorted({entry.get("time") for _, entry in items if entry.get("time")})
+            marked = set()
+            for chunk in chunked(faculty, DEFAULT_CHUNK_SIZE):
+                def posted_for(query, chunk=chunk):
+                    return query.eq("role", "faculty").eq("date", str(day)).in_("username", chunk).in_("time", times)
+                posted = scan_table("notifications", "id, username, date, time, subject, division", posted_for)
+                marked.update((slot_key(note["date"], note), note["username"]) for note in posted)
+            for when, entry in items:
+                if (slot_key(str(day), entry), entry.get("faculty")) not in marked:
+                    self.sink.emit(_message(UNMARKED, day, entry, when))
+                    self.sent[UNMARKED] += 1
+
+    # ---------------------- Running ----------------------
+    def run(self, clock=datetime.now, sleep=time.sleep, max_sleep=60.0):
+        # Sleeps until the next event (waking at least every max_sleep
+        # seconds, so clock changes are noticed) and handles everything due.
+        self.plan_day(clock().date(), clock())
+        while self.heap:
+            wait = (self.next_time() - clock()).total_seconds()
+            if wait > 0:
+                sleep(min(wait, max_sleep))
+                continue
+            self.handle(self.pop_due(clock()))
+
+    def simulate_day(self, day):
+        # Plays one whole day's events in order without waiting.
+        self.plan_day(day)
+        end = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        while self.heap and self.next_time() < end:
+            self.handle(self.pop_due(self.next_time()))
+        return dict(self.sent)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send class reminders and flag classes left unmarked.")
+    parser.add_argument("--sink", default="log", help="'log' (default) or 'jsonl:PATH'.")
+    parser.add_argument("--lead-minutes", type=float, help="Minutes before a class to remind (REMINDER_LEAD_MINUTES).")
+    parser.add_argument("--grace-minutes", type=float, help="Minutes after a class to flag it unmarked (UNMARKED_GRACE_MINUTES).")
+    parser.add_argument("--simulate", metavar="YYYY-MM-DD", help="Play this day's events at once and exit.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    try:
+        sink = make_sink(args.sink)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Paged: thousands of slots run past the API's row cap (1000 on Supabase).
+    scheduler = ReminderScheduler(
+        list(scan_table("timetable", "*")),
+        sink,
+        lead=timedelta(minutes=args.lead_minutes) if args.lead_minutes is not None else REMINDER_LEAD,
+        grace=timedelta(minutes=args.grace_minutes) if args.grace_minutes is not None else UNMARKED_GRACE,
+    )
+    slots = sum(len(entries) for entries in scheduler.by_day.values())
+    print(f"Loaded {slots} timetable slots.")
+
+    if args.simulate:
+        started = time.perf_counter()
+        sent = scheduler.simulate_day(date.fromisoformat(args.simulate))
+        print(f"Sent {sent[REMINDER]} reminders and flagged {sent[UNMARKED]} unmarked classes "
+              f"in {time.perf_counter() - started:.2f}s.")
+    else:
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            print(f"Stopped after {scheduler.sent[REMINDER]} reminders and {scheduler.sent[UNMARKED]} unmarked flags.")
@@ -0,0 +1,108 @@
+import pandas as pd
+
+SLOT_KEY = ["date", "time", "subject"]
+SUMMARY_COLUMNS = ["subject", "status", "username", "division", "date"]
+
+
+# ---------------------- Responses ----------------------
+def response_text(responses):
+    # Responses are stored either as plain text or as {"by": ..., "message": ...}
+    return responses.map(
+        lambda r: r.get("message", "") if isinstance(r, dict) else (r if isinstance(r, str) else "")
+    )
+
+
+# ---------------------- Faculty Not Present ----------------------
+def faculty_not_present(df_stu, df_fac, key=SLOT_KEY):
+    # Anti-join of reported slots against faculty records: a slot counts when
+    # no faculty record exists for it, or the first one says "I'm unavailable".
+    slots = df_stu[key].dropna().drop_duplicates().sort_values(key)
+    first_fac = df_fac.drop_duplicates(key, keep="first")[key + ["response"]]
+    merged = slots.merge(first_fac, on=key, how="left", indicator=True)
+
+    unavailable = response_text(merged["response"]).str.strip().str.lower() == "i'm unavailable"
+    missing = (merged["_merge"] == "left_only") | unavailable
+    return merged.loc[missing, key].reset_index(drop=True)
+
+
+def build_status_summary(df_fac, df_stu, username, division):
+    frames = [df_fac[SUMMARY_COLUMNS]] if not df_fac.empty else []
+
+    if not df_stu.empty:
+        missing = faculty_not_present(df_stu, df_fac)
+        frames.append(pd.DataFrame({
+            "subject": missing["subject"],
+            "status": "Faculty Not Present",
+            "username": username,
+            "division": division,
+            "date": missing["date"],
+        }, columns=SUMMARY_COLUMNS))
+
+    if not frames:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------- Monthly Rollup ----------------------
+ROLLUP_KEY = ["faculty", "division", "subject", "status", "year_month"]
+ROLLUP_COLUMNS = ROLLUP_KEY + ["count"]
+FACULTY_SLOT_KEY = ["faculty", "division"] + SLOT_KEY
+
+
+def normalize_notifications(notifications):
+    df = pd.DataFrame(notifications)
+    for col in ["role", "username", "faculty", "date", "time", "subject", "status", "division", "response"]:
+        if col not in df.columns:
+            df[col] = None
+
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df = df.dropna(subset=["date"])
+        df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    df["year_month"] = df["date"].str[:7]
+    return df
+
+
+def compute_rollup(notifications):
+    # Counts per (faculty, division, subject, status, year-month): faculty
+    # statuses as recorded, plus one "Faculty Not Present" per reported slot
+    # that the reported faculty member has no record (or is unavailable) for.
+    df = normalize_notifications(notifications)
+    df_fac = df[df["role"] == "faculty"].assign(faculty=lambda d: d["username"])
+    df_stu = df[df["role"] == "student"]
+
+    frames = []
+    if not df_fac.empty:
+        frames.append(df_fac.groupby(ROLLUP_KEY).size().reset_index(name="count"))
+    if not df_stu.empty:
+        missing = faculty_not_present(df_stu, df_fac, key=FACULTY_SLOT_KEY)
+        missing["status"] = "Faculty Not Present"
+        missing["year_month"] = missing["date"].str[:7]
+        frames.append(missing.groupby(ROLLUP_KEY).size().reset_index(name="count"))
+
+    if not frames:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    return pd.concat(frames, ignore_index=True)[ROLLUP_COLUMNS]
+
+
+# ---------------------- Term Cube ----------------------
+def build_term_cube(notifications):
+    # The whole term in one pass: counts for every division x month x
+    # subject x status (and faculty), ready to be sliced without re-querying.
+    return compute_rollup(notifications)
+
+
+def slice_cube(cube, division=None, year_month=None):
+    mask = pd.Series(True, index=cube.index)
+    if division:
+        mask &= cube["division"] == division
+    if year_month:
+        mask &= cube["year_month"] == year_month
+    return cube[mask].groupby(["subject", "status"], as_index=False)["count"].sum().rename(columns={"count": "Count"})
+
+
+def term_pivot(cube):
+    return cube.pivot_table(
+        index=["division", "subject"], columns=["year_month", "status"],
+        values="count", aggfunc="sum", fill_value=0
+    )
@@ -0,0 +1,105 @@
+from calendar import monthrange
+from supabase_setup import init_supabase
+from bulk_sync import scan_table
+from shared_cache import bump, cached
+from report_engine import ROLLUP_COLUMNS, ROLLUP_KEY, compute_rollup
+
+ROLLUP_TABLE = "notification_rollup"
+ROLLUP_CONFLICT = ",".join(ROLLUP_KEY)
+WRITE_CHUNK_SIZE = 500
+
+
+def month_range(year_month):
+    year, month = (int(part) for part in year_month.split("-"))
+    return f"{year_month}-01", f"{year_month}-{monthrange(year, month)[1]:02d}"
+
+
+def _rollup_rows(df):
+    return [
+        {**{col: row[col] for col in ROLLUP_KEY}, "count": int(row["count"])}
+        for row in df[ROLLUP_COLUMNS].to_dict("records")
+    ]
+
+
+def _write_rollup(rows, stale_rows):
+    # Rows that disappeared from a partition are zeroed rather than deleted,
+    # so the whole refresh is a single upsert.
+    payload = rows + [{**{col: row[col] for col in ROLLUP_KEY}, "count": 0} for row in stale_rows]
+    client = init_supabase()
+    for start in range(0, len(payload), WRITE_CHUNK_SIZE):
+        client.table(ROLLUP_TABLE).upsert(payload[start:start + WRITE_CHUNK_SIZE], on_conflict=ROLLUP_CONFLICT).execute()
+
+
+# ---------------------- Incremental Refresh ----------------------
+def refresh_partitions(partitions):
+    # Called after every insert, undo, delete or response on notifications.
+    # Each touched (division, subject, month) partition is recounted by the
+    # database in one transaction (sql/010), so concurrent writes to one
+    # partition can't overwrite each other's counts and no read is capped.
+    partitions = {(division, subject, str(date)[:7]) for division, subject, date in partitions
+                  if division and subject and date}
+    client = init_supabase()
+    for division, subject, year_month in sorted(partitions):
+        client.rpc("refresh_rollup_partition", {
+            "p_division": division, "p_subject": subject, "p_year_month": year_month
+        }).execute()
+    if partitions:
+        bump(ROLLUP_TABLE, partitions)
+
+
+def refresh_partition(division, subject, date):
+    refresh_partitions([(division, subject, date)])
+
+
+def refresh_for(note):
+    refresh_partition(note.get("division"), note.get("subject"), note.get("date"))
+
+
+# ---------------------- Reads ----------------------
+def fetch_rollup(faculty, division, year_month, subjects=None):
+    # Cached per (division, subject, month) partition, the unit refreshes
+    # bump, so one faculty member's write leaves other reports cached.
+    def load():
+        query = init_supabase().table(ROLLUP_TABLE).select("subject, status, count") \
+            .eq("faculty", faculty).eq("division", division).eq("year_month", year_month).gt("count", 0)
+        if subjects:
+            query = query.in_("subject", subjects)
+        return query.execute().data or []
+    subjects = sorted(subjects) if subjects else None
+    partitions = [(division, subject, year_month) for subject in subjects] if subjects else None
+    return cached(ROLLUP_TABLE, ("fetch", faculty, division, year_month, tuple(subjects or ())), load, partitions)
+
+
+# ---------------------- Backfill ----------------------
+def rebuild_rollup(from_month=None, to_month=None):
+    start_date = month_range(from_month)[0] if from_month else None
+    end_date = month_range(to_month)[1] if to_month else None
+
+    def note_filters(query):
+        if start_date:
+            query = query.gte("date", start_date)
+        if end_date:
+            query = query.lte("date", end_date)
+        return query
+
+    def rollup_filters(query):
+        if from_month:
+            query = query.gte("year_month", from_month)
+        if to_month:
+            query = query.lte("year_month", to_month)
+        return query.gt("count", 0)
+
+    notes = list(scan_table(
+        "notifications",
+        "id, role, username, faculty, division, subject, date, time, status, response",
+        note_filters
+    ))
+    rows = _rollup_rows(compute_rollup(notes))
+
+    fresh = {tuple(row[col] for col in ROLLUP_KEY) for row in rows}
+    current = scan_table(ROLLUP_TABLE, "id, " + ", ".join(ROLLUP_KEY), rollup_filters)
+    stale = [row for row in current if tuple(row[col] for col in ROLLUP_KEY) not in fresh]
+
+    _write_rollup(rows, stale)
+    bump(ROLLUP_TABLE)
+    return {"notifications": len(notes), "rollup_rows": len(rows), "zeroed": len(stale)}
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# One cache per app process, shared by every session. Entries are dropped
+# least-recently-used first once either limit is reached.
+MAX_BYTES = int(float(os.getenv("SHARED_CACHE_MAX_MB", "64")) * 1024 * 1024)
+MAX_ENTRIES = int(os.getenv("SHARED_CACHE_MAX_ENTRIES", "2048"))
+# Writes made by this process invalidate entries at once through bump();
+# the TTL only bounds how long writes from other processes can go unseen.
+DEFAULT_TTL = float(os.getenv("SHARED_CACHE_TTL", "600"))
+
+_lock = threading.Lock()
+_entries = OrderedDict()      # (table, key) -> entry dict
+_bytes = 0
+_loading = {}                 # (table, key) -> lock held while loading
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+# Versions: every write bumps its table's write count; a write that names
+# its partitions bumps only those, a write that doesn't resets the table.
+_table_writes = {}
+_table_resets = {}
+_partition_versions = {}
+
+
+# ---------------------- Versions ----------------------
+def bump(table, partitions=None):
+    # Called after every write. partitions lists the partition keys the write
+    # touched (e.g. ("faculty", "ABC@ldce.ac.in")); None means "anything".
+    with _lock:
+        _table_writes[table] = _table_writes.get(table, 0) + 1
+        if partitions is None:
+            _table_resets[table] = _table_resets.get(table, 0) + 1
+            return
+        for partition in set(partitions):
+            key = (table, partition)
+            _partition_versions[key] = _partition_versions.get(key, 0) + 1
+
+
+def version(table):
+    # Changes on every write to the table from this process.
+    return _table_writes.get(table, 0)
+
+
+def _snapshot(table, partitions):
+    # An entry read from the whole table is stale after any write to it; one
+    # read from named partitions only after writes to those (or a reset).
+    if partitions is None:
+        return (_table_writes.get(table, 0),)
+    return (_table_resets.get(table, 0),) + tuple(_partition_versions.get((table, p), 0) for p in partitions)
+
+
+# ---------------------- Entries ----------------------
+def _sizeof(value):
+    if hasattr(value, "approx_bytes"):
+        return value.approx_bytes()
+    if hasattr(value, "memory_usage"):          # pandas DataFrame
+        return int(value.memory_usage(deep=True).sum())
+    return len(json.dumps(value, default=str))
+
+
+def _evict():
+    global _bytes
+    while _entries and (_bytes > MAX_BYTES or len(_entries) > MAX_ENTRIES):
+        _, entry = _entries.popitem(last=False)
+        _bytes -= entry["bytes"]
+        _stats["evictions"] += 1
+
+
+def _lookup(cache_key, snapshot):
+    entry = _entries.get(cache_key)
+    if entry is None:
+        return None
+    if entry["snapshot"] != snapshot or time.monotonic() > entry["expires"]:
+        return None
+    _entries.move_to_end(cache_key)
+    return entry
+
+
+def cached(table, key, load, partitions=None, ttl=None):
+    # Returns load() for (table, key), sharing one copy across sessions until
+    # a write bumps the table or one of the listed partitions. Callers must
+    # treat the returned value as read-only.
+    global _bytes
+    cache_key = (table, key)
+    partitions = tuple(partitions) if partitions is not None else None
+    with _lock:
+        entry = _lookup(cache_key, _snapshot(table, partitions))
+        if entry is not None:
+            _stats["hits"] += 1
+            return entry["value"]
+        loading = _loading.setdefault(cache_key, threading.Lock())
+
+    # One session loads while concurrent callers for the same key wait for
+    # its result instead of issuing the same query.
+    with loading:
+        with _lock:
+            snapshot = _snapshot(table, partitions)
+            entry = _lookup(cache_key, snapshot)
+            if entry is not None:
+                _stats["hits"] += 1
+                return entry["value"]
+            _stats["misses"] += 1
+        try:
+            value = load()
+        finally:
+            with _lock:
+                _loading.pop(cache_key, None)
+
+        size = _sizeof(value)
+        with _lock:
+            old = _entries.pop(cache_key, None)
+            if old is not None:
+                _bytes -= old["bytes"]
+            # A write that raced with the load leaves the entry stale at once,
+            # because it is stored under the snapshot taken before loading.
+            if size <= MAX_BYTES:
+                _entries[cache_key] = {
+                    "value": value,
+                    "snapshot": snapshot,
+                    "bytes": size,
+                    "expires": time.monotonic() + (DEFAULT_TTL if ttl is None else ttl),
+                }
+                _bytes += size
+                _evict()
+        return value
+
+
+def clear(table=None):
+    global _bytes
+    with _lock:
+        for cache_key in [k for k in _entries if table is None or k[0] == table]:
+            _bytes -= _entries.pop(cache_key)["bytes"]
+
+
+def cache_stats():
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            "entries": len(_entries),
+            "bytes": _bytes,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+            **_stats,
+        }
@@ -0,0 +1,3 @@
+-- Timetable view: one faculty member's notifications for a date (or week).
+create index if not exists notifications_role_username_date_idx
+    on notifications (role, username, date);
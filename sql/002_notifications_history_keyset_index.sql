@@ -0,0 +1,7 @@
+-- Notification history: newest-first keyset pages per faculty member and
+-- per division, matching order by (timestamp desc, id desc).
+create index if not exists notifications_role_username_timestamp_idx
+    on notifications (role, username, "timestamp" desc, id desc);
+
+create index if not exists notifications_role_division_timestamp_idx
+    on notifications (role, division, "timestamp" desc, id desc);
@@ -0,0 +1,20 @@
+-- Pre-aggregated monthly report counts, maintained by the app after every
+-- notification write (rollup_store.refresh_partition) and backfilled with
+-- `python rebuild_rollup.py`.
+create table if not exists notification_rollup (
+    id bigint generated always as identity primary key,
+    faculty text not null,
+    division text not null,
+    subject text not null,
+    status text not null,
+    year_month text not null,
+    count integer not null default 0,
+    unique (faculty, division, subject, status, year_month)
+);
+
+create index if not exists notification_rollup_partition_idx
+    on notification_rollup (division, subject, year_month);
+
+-- Partition refreshes read one division/subject/month of notifications.
+create index if not exists notifications_division_subject_date_idx
+    on notifications (division, subject, date);
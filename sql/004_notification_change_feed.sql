@@ -0,0 +1,22 @@
+-- Session change feeds read notifications changed since their cursor and
+-- tombstones for rows deleted since then (change_feed.NotificationFeed).
+alter table notifications add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists notifications_updated_at_idx
+    on notifications (updated_at);
+
+create table if not exists notification_tombstones (
+    id bigint primary key,  -- id of the deleted notification
+    role text,
+    username text,
+    faculty text,
+    division text,
+    date text,
+    deleted_at timestamptz not null default now()
+);
+
+create index if not exists notification_tombstones_deleted_at_idx
+    on notification_tombstones (deleted_at);
+
+-- Tombstones only need to outlive the longest-idle session; prune with e.g.
+-- delete from notification_tombstones where deleted_at < now() - interval '7 days';
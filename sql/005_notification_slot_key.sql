@@ -0,0 +1,21 @@
+-- WARNING: destructive. Deletes duplicate notifications (see below); back up
+-- the notifications table before running it.
+-- One notification per (slot, author): faculty status and student reports
+-- are upserted on this key, and Undo / Delete / responses match on it.
+
+-- Keep the earliest row of any duplicates created by double clicks before
+-- the key existed. Re-run `python rebuild_rollup.py` afterwards.
+delete from notifications n
+using notifications d
+where n.id > d.id
+  and n.faculty is not distinct from d.faculty
+  and n.division is not distinct from d.division
+  and n.subject is not distinct from d.subject
+  and n.date is not distinct from d.date
+  and n.time is not distinct from d.time
+  and n.role is not distinct from d.role
+  and n.username is not distinct from d.username;
+
+create unique index if not exists notifications_slot_key_idx
+    on notifications (faculty, division, subject, date, time, role, username)
+    nulls not distinct;
@@ -0,0 +1,9 @@
+-- Admin panel: faculty listing ordered by username, and substring search
+-- (username ilike '%...%') served by a trigram index.
+create extension if not exists pg_trgm;
+
+create index if not exists users_role_username_idx
+    on users (role, username);
+
+create index if not exists users_username_trgm_idx
+    on users using gin (username gin_trgm_ops);
@@ -0,0 +1,24 @@
+-- Faculty inbox: student absence reports grouped per missed slot, with the
+-- number of reporters and how many still await a response. Read by
+-- notification_store.fetch_inbox(); replies update a whole group at once.
+create or replace view faculty_inbox as
+select
+    faculty,
+    division,
+    subject,
+    date,
+    day,
+    time,
+    count(*) as reports,
+    count(*) filter (where response is null) as pending,
+    string_agg(username, ', ' order by username) as reporters,
+    max(timestamp) as latest,
+    max(response->>'message') as response_message
+from notifications
+where role = 'student'
+group by faculty, division, subject, date, day, time;
+
+-- The inbox reads one faculty member's recent reports, newest date first.
+create index if not exists notifications_student_faculty_date_idx
+    on notifications (faculty, date desc)
+    where role = 'student';
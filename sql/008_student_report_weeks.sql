@@ -0,0 +1,13 @@
+-- Student report history: one row per student and ISO week (Monday start)
+-- with the number of reports and how many were answered. The page lists
+-- these buckets and reads a week's reports only when it is opened
+-- (notification_store.fetch_report_weeks / fetch_report_week).
+create or replace view student_report_weeks as
+select
+    username,
+    to_char(date_trunc('week', date::date), 'YYYY-MM-DD') as week_start,
+    count(*) as reports,
+    count(response) as answered
+from notifications
+where role = 'student'
+group by 1, 2;
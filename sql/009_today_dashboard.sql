@@ -0,0 +1,46 @@
+-- Today's view in one round trip: a date's classes for one faculty member
+-- or division, each with the faculty status posted for it (null when the
+-- class is still unmarked) and the student absence reports it received.
+-- Called as rpc('today_dashboard', ...) by notification_store.fetch_day_dashboard().
+create or replace function today_dashboard(p_date text, p_faculty text default null, p_division text default null)
+returns table (
+    id bigint,
+    day text,
+    "time" text,
+    subject text,
+    faculty text,
+    division text,
+    batch text,
+    room text,
+    type text,
+    status text,
+    marked_by text,
+    marked_at text,
+    reports bigint,
+    pending_reports bigint
+)
+language sql stable
+as $$
+    select
+        t.id, t.day, t.time, t.subject, t.faculty, t.division, t.batch, t.room, t.type,
+        n.status,
+        n.username,
+        n.timestamp::text,
+        (select count(*) from notifications s
+         where s.role = 'student' and s.faculty = t.faculty and s.date = p_date
+           and s.time = t.time and s.subject = t.subject
+           and coalesce(s.division, '') = coalesce(t.division, '')),
+        (select count(*) from notifications s
+         where s.role = 'student' and s.faculty = t.faculty and s.date = p_date
+           and s.time = t.time and s.subject = t.subject
+           and coalesce(s.division, '') = coalesce(t.division, '')
+           and s.response is null)
+    from timetable t
+    left join notifications n
+        on n.role = 'faculty' and n.username = t.faculty and n.faculty = t.faculty
+       and n.date = p_date and n.time = t.time and n.subject = t.subject
+       and coalesce(n.division, '') = coalesce(t.division, '')
+    where t.day = to_char(p_date::date, 'FMDay')
+      and (p_faculty is null or t.faculty = p_faculty)
+      and (p_division is null or t.division = p_division);
+$$;
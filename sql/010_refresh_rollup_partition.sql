@@ -0,0 +1,55 @@
+-- Recounts one (division, subject, month) rollup partition inside the
+-- database, in one transaction: rollup_store.refresh_partitions() calls it
+-- after every notification write. Refreshes of the same partition queue on
+-- an advisory lock, so each one counts every write committed before it and
+-- the last refresh always leaves the partition up to date.
+-- Same rules as report_engine.compute_rollup(): faculty statuses as
+-- recorded, plus one "Faculty Not Present" per student-reported slot the
+-- faculty member has no record for, or whose first record answers
+-- "I'm unavailable".
+create or replace function refresh_rollup_partition(p_division text, p_subject text, p_year_month text)
+returns void
+language plpgsql
+as $$
+begin
+    perform pg_advisory_xact_lock(hashtext('notification_rollup|' || p_division || '|' || p_subject || '|' || p_year_month));
+
+    update notification_rollup
+    set count = 0
+    where division = p_division and subject = p_subject and year_month = p_year_month and count > 0;
+
+    insert into notification_rollup (faculty, division, subject, status, year_month, count)
+    select faculty, p_division, p_subject, status, p_year_month, count(*)
+    from (
+        select n.username as faculty, n.status
+        from notifications n
+        where n.role = 'faculty' and n.division = p_division and n.subject = p_subject
+          and n.date between p_year_month || '-01' and p_year_month || '-31'
+          and n.username is not null and n.status is not null
+        union all
+        select s.faculty, 'Faculty Not Present'
+        from (
+            select distinct faculty, date, time
+            from notifications
+            where role = 'student' and division = p_division and subject = p_subject
+              and date between p_year_month || '-01' and p_year_month || '-31'
+              and faculty is not null and time is not null
+        ) s
+        left join lateral (
+            select f.id, f.response
+            from notifications f
+            where f.role = 'faculty' and f.username = s.faculty and f.division = p_division
+              and f.subject = p_subject and f.date = s.date and f.time = s.time
+            order by f.id
+            limit 1
+        ) first_record on true
+        where first_record.id is null
+           or lower(trim(case jsonb_typeof(to_jsonb(first_record.response))
+                   when 'object' then to_jsonb(first_record.response) ->> 'message'
+                   when 'string' then to_jsonb(first_record.response) #>> '{}'
+               end)) = 'i''m unavailable'
+    ) counted
+    group by faculty, status
+    on conflict (faculty, division, subject, status, year_month) do update set count = excluded.count;
+end;
+$$;
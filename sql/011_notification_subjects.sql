@@ -0,0 +1,9 @@
+-- Subjects a notification history scope has entries for: one row per
+-- (role, username, division, subject). The history page's subject filter
+-- lists these (notification_store.history_subjects), so subjects that have
+-- since left the timetable can still be filtered.
+create or replace view notification_subjects as
+select role, username, division, subject, count(*) as notifications
+from notifications
+where subject is not null
+group by role, username, division, subject;
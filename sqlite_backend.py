@@ -0,0 +1,542 @@
+import json
+import os
+import sqlite3
+import threading
+
+# ---------------------- Schema ----------------------
+# Mirrors the Supabase tables (and the indexes from sql/) closely enough for
+# every query the pages issue. JSON columns are stored as text.
+SCHEMA = """
+create table if not exists timetable (
+    id integer primary key autoincrement,
+    day text, time text, subject text, faculty text,
+    division text, batch text, room text, type text
+);
+create index if not exists timetable_faculty_day_idx on timetable (faculty, day);
+create index if not exists timetable_division_day_idx on timetable (division, day);
+
+create table if not exists users (
+    id integer primary key autoincrement,
+    username text unique not null,
+    password text, role text, division text,
+    divisions text, subjects text
+);
+create index if not exists users_role_idx on users (role);
+
+create table if not exists notifications (
+    id integer primary key autoincrement,
+    username text, role text, subject text, division text, day text,
+    date text, time text, faculty text, type text, status text,
+    message text, timestamp text, response text,
+    updated_at text not null default (strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))
+);
+create index if not exists notifications_role_username_date_idx on notifications (role, username, date);
+create index if not exists notifications_role_username_timestamp_idx on notifications (role, username, timestamp desc, id desc);
+create index if not exists notifications_role_division_timestamp_idx on notifications (role, division, timestamp desc, id desc);
+create index if not exists notifications_division_subject_date_idx on notifications (division, subject, date);
+create index if not exists notifications_role_faculty_idx on notifications (role, faculty);
+create index if not exists notifications_updated_at_idx on notifications (updated_at);
+create unique index if not exists notifications_slot_key_idx
+    on notifications (faculty, division, subject, date, time, role, username);
+
+create table if not exists notification_rollup (
+    id integer primary key autoincrement,
+    faculty text not null, division text not null, subject text not null,
+    status text not null, year_month text not null,
+    count integer not null default 0,
+    unique (faculty, division, subject, status, year_month)
+);
+create index if not exists notification_rollup_partition_idx on notification_rollup (division, subject, year_month);
+
+create table if not exists notification_tombstones (
+    id integer primary key,
+    role text, username text, faculty text, division text, date text,
+    deleted_at text not null
+);
+create index if not exists notification_tombstones_deleted_at_idx on notification_tombstones (deleted_at);
+
+create index if not exists notifications_student_faculty_date_idx on notifications (faculty, date desc) where role = 'student';
+create view if not exists faculty_inbox as
+select faculty, division, subject, date, day, time,
+    count(*) as reports,
+    sum(response is null) as pending,
+    group_concat(username, ', ') as reporters,
+    max(timestamp) as latest,
+    max(json_extract(response, '$.message')) as response_message
+from (select * from notifications where role = 'student' order by username)
+group by faculty, division, subject, date, day, time;
+create view if not exists student_report_weeks as
+select username, date(date, 'weekday 0', '-6 days') as week_start,
+    count(*) as reports, count(response) as answered
+from notifications
+where role = 'student'
+group by username, week_start;
+create view if not exists notification_subjects as
+select role, username, division, subject, count(*) as notifications
+from notifications
+where subject is not null
+group by role, username, division, subject;
+"""
+
+JSON_COLUMNS = {
+    "users": {"divisions", "subjects"},
+    "notifications": {"response"},
+}
+
+# Stand-ins for the SQL functions in sql/, called through client.rpc() with
+# the same named parameters (missing ones are passed as null). A function
+# given as a list of statements runs them in one transaction.
+RPC_FUNCTIONS = {
+    "today_dashboard": ("""
+        select t.id, t.day, t.time, t.subject, t.faculty, t.division, t.batch, t.room, t.type,
+            n.status, n.username as marked_by, n.timestamp as marked_at,
+            (select count(*) from notifications s
+             where s.role = 'student' and s.faculty = t.faculty and s.date = :p_date
+               and s.time = t.time and s.subject = t.subject
+               and coalesce(s.division, '') = coalesce(t.division, '')) as reports,
+            (select count(*) from notifications s
+             where s.role = 'student' and s.faculty = t.faculty and s.date = :p_date
+               and s.time = t.time and s.subject = t.subject
+               and coalesce(s.division, '') = coalesce(t.division, '')
+               and s.response is null) as pending_reports
+        from timetable t
+        left join notifications n
+            on n.role = 'faculty' and n.username = t.faculty and n.faculty = t.faculty
+           and n.date = :p_date and n.time = t.time and n.subject = t.subject
+           and coalesce(n.division, '') = coalesce(t.division, '')
+        where t.day = case cast(strftime('%w', :p_date) as integer)
+                when 0 then 'Sunday' when 1 then 'Monday' when 2 then 'Tuesday' when 3 then 'Wednesday'
+                when 4 then 'Thursday' when 5 then 'Friday' else 'Saturday' end
+          and (:p_faculty is null or t.faculty = :p_faculty)
+          and (:p_division is null or t.division = :p_division)
+    """, ("p_date", "p_faculty", "p_division")),
+    "refresh_rollup_partition": ([
+        """
+        update notification_rollup set count = 0
+        where division = :p_division and subject = :p_subject and year_month = :p_year_month and count > 0
+        """,
+        """
+        insert into notification_rollup (faculty, division, subject, status, year_month, count)
+        select faculty, :p_division, :p_subject, status, :p_year_month, count(*)
+        from (
+            select n.username as faculty, n.status
+            from notifications n
+            where n.role = 'faculty' and n.division = :p_division and n.subject = :p_subject
+              and n.date between :p_year_month || '-01' and :p_year_month || '-31'
+              and n.username is not null and n.status is not null
+            union all
+            select s.faculty, 'Faculty Not Present'
+            from (
+                select distinct faculty, date, time
+                from notifications
+                where role = 'student' and division = :p_division and subject = :p_subject
+                  and date between :p_year_month || '-01' and :p_year_month || '-31'
+                  and faculty is not null and time is not null
+            ) s
+            where not exists (
+                select 1 from notifications f
+                where f.role = 'faculty' and f.username = s.faculty and f.division = :p_division
+                  and f.subject = :p_subject and f.date = s.date and f.time = s.time
+            )
+            or (
+                select lower(trim(case json_type(f.response)
+                    when 'object' then json_extract(f.response, '$.message')
+                    when 'text' then json_extract(f.response, '$')
+                end))
+                from notifications f
+                where f.role = 'faculty' and f.username = s.faculty and f.division = :p_division
+                  and f.subject = :p_subject and f.date = s.date and f.time = s.time
+                order by f.id
+                limit 1
+            ) = 'i''m unavailable'
+        ) counted
+        group by faculty, status
+        on conflict (faculty, division, subject, status, year_month) do update set count = excluded.count
+        """,
+    ], ("p_division", "p_subject", "p_year_month")),
+}
+
+SEED_FILES = {
+    "timetable": "timetable.json",
+    "users": "users.json",
+}
+
+
+class APIError(Exception):
+    pass
+
+
+class APIResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+# ---------------------- Filters ----------------------
+OPERATORS = {
+    "eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<=",
+    "like": "like", "ilike": "like",
+}
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _split_top_level(text):
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and char == ",":
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _parse_value(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+def _condition(column, op, value):
+    if op == "is":
+        value = str(value).lower()
+        if value == "null":
+            return f"{_quote(column)} is null", []
+        return f"{_quote(column)} is {1 if value == 'true' else 0}", []
+    if op == "in":
+        values = list(value)
+        if not values:
+            return "0", []
+        return f"{_quote(column)} in ({', '.join('?' for _ in values)})", values
+    if op == "ilike":
+        return f"lower({_quote(column)}) like lower(?)", [str(value).replace("*", "%")]
+    if op == "like":
+        return f"{_quote(column)} like ?", [str(value).replace("*", "%")]
+    return f"{_quote(column)} {OPERATORS[op]} ?", [value]
+
+
+def _logic_tree(expression, joiner):
+    # PostgREST logic trees: "a.eq.1,and(b.gt.2,c.lt.3)"
+    clauses, params = [], []
+    for part in _split_top_level(expression):
+        part = part.strip()
+        for nested in ("and", "or"):
+            if part.startswith(nested + "(") and part.endswith(")"):
+                sql, values = _logic_tree(part[len(nested) + 1:-1], f" {nested} ")
+                break
+        else:
+            column, op, raw = part.split(".", 2)
+            if op == "in":
+                value = [_parse_value(v) for v in _split_top_level(raw.strip("()"))]
+            else:
+                value = _parse_value(raw)
+            sql, values = _condition(column, op, value)
+        clauses.append(f"({sql})")
+        params.extend(values)
+    return joiner.join(clauses), params
+
+
+# ---------------------- Query Builder ----------------------
+class QueryBuilder:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.action = "select"
+        self.columns = "*"
+        self.payload = None
+        self.on_conflict = None
+        self.count_method = None
+        self.head = False
+        self.filters = []
+        self.params = []
+        self.orders = []
+        self.limit_count = None
+        self.offset_count = None
+
+    # --- actions ---
+    def select(self, *columns, count=None, head=None):
+        self.columns = ",".join(columns) if columns else "*"
+        self.count_method = count
+        self.head = bool(head)
+        return self
+
+    def insert(self, json_data, upsert=False, on_conflict=None, **kwargs):
+        self.action = "upsert" if upsert else "insert"
+        self.payload = json_data
+        self.on_conflict = on_conflict
+        return self
+
+    def upsert(self, json_data, on_conflict=None, ignore_duplicates=False, **kwargs):
+        self.action = "upsert_ignore" if ignore_duplicates else "upsert"
+        self.payload = json_data
+        self.on_conflict = on_conflict
+        return self
+
+    def update(self, json_data, **kwargs):
+        self.action = "update"
+        self.payload = json_data
+        return self
+
+    def delete(self, **kwargs):
+        self.action = "delete"
+        return self
+
+    # --- filters ---
+    def _filter(self, column, op, value):
+        sql, values = _condition(column, op, value)
+        self.filters.append(sql)
+        self.params.extend(values)
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def like(self, column, pattern):
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column, pattern):
+        return self._filter(column, "ilike", pattern)
+
+    def is_(self, column, value):
+        return self._filter(column, "is", value)
+
+    def in_(self, column, values):
+        return self._filter(column, "in", values)
+
+    def or_(self, filters, reference_table=None):
+        sql, values = _logic_tree(filters, " or ")
+        self.filters.append(sql)
+        self.params.extend(values)
+        return self
+
+    # --- modifiers ---
+    def order(self, column, desc=False, nullsfirst=None, foreign_table=None):
+        if nullsfirst is None:
+            nullsfirst = desc  # PostgreSQL default
+        direction = "desc" if desc else "asc"
+        nulls = "first" if nullsfirst else "last"
+        self.orders.append(f"{_quote(column)} {direction} nulls {nulls}")
+        return self
+
+    def limit(self, size, foreign_table=None):
+        self.limit_count = size
+        return self
+
+    def range(self, start, end, foreign_table=None):
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    # --- execution ---
+    def _where(self):
+        if not self.filters:
+            return "", []
+        return " where " + " and ".join(f"({f})" for f in self.filters), list(self.params)
+
+    def _select_list(self):
+        if self.columns.strip() == "*":
+            return "*"
+        return ", ".join(_quote(c.strip()) for c in self.columns.split(",") if c.strip())
+
+    def execute(self):
+        return self.client.run(self)
+
+
+class RPCCall:
+    def __init__(self, client, fn, params):
+        self.client = client
+        self.fn = fn
+        self.params = params
+
+    def execute(self):
+        return self.client.run_rpc(self.fn, self.params)
+
+
+class SQLiteClient:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("pragma journal_mode=wal")
+        self.conn.execute("pragma synchronous=normal")
+        self.conn.executescript(SCHEMA)
+        self.columns = {
+            table: [row["name"] for row in self.conn.execute(f"pragma table_info({_quote(table)})")]
+            for table in self.tables()
+        }
+
+    def tables(self):
+        return [row["name"] for row in self.conn.execute(
+            "select name from sqlite_master where type in ('table', 'view') and name not like 'sqlite_%'"
+        )]
+
+    def table(self, table_name):
+        return QueryBuilder(self, table_name)
+
+    def from_(self, table_name):
+        return self.table(table_name)
+
+    def rpc(self, fn, params=None, *args, **kwargs):
+        return RPCCall(self, fn, params or {})
+
+    # ---------------------- Encoding ----------------------
+    def _encode(self, table, row):
+        json_columns = JSON_COLUMNS.get(table, set())
+        known = self.columns.get(table)
+        encoded = {}
+        for column, value in row.items():
+            if known is not None and column not in known:
+                raise APIError(f"Could not find the '{column}' column of '{table}'")
+            if column in json_columns and value is not None:
+                value = json.dumps(value)
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value)
+            encoded[column] = value
+        return encoded
+
+    def _decode(self, table, row):
+        json_columns = JSON_COLUMNS.get(table, set())
+        decoded = dict(row)
+        for column in json_columns & decoded.keys():
+            if isinstance(decoded[column], str):
+                try:
+                    decoded[column] = json.loads(decoded[column])
+                except ValueError:
+                    pass
+        return decoded
+
+    # ---------------------- Execution ----------------------
+    def run(self, query):
+        with self.lock:
+            try:
+                with self.conn:
+                    return getattr(self, f"_run_{query.action.split('_')[0]}")(query)
+            except sqlite3.Error as e:
+                raise APIError(str(e)) from e
+
+    def run_rpc(self, fn, params):
+        if fn not in RPC_FUNCTIONS:
+            raise APIError(f"Could not find the function {fn}")
+        sql, names = RPC_FUNCTIONS[fn]
+        unknown = set(params) - set(names)
+        if unknown:
+            raise APIError(f"Unknown parameters for {fn}: {', '.join(sorted(unknown))}")
+        values = {name: params.get(name) for name in names}
+        with self.lock:
+            try:
+                with self.conn:
+                    for statement in sql if isinstance(sql, list) else [sql]:
+                        rows = self.conn.execute(statement, values).fetchall()
+            except sqlite3.Error as e:
+                raise APIError(str(e)) from e
+        return APIResponse([dict(row) for row in rows])
+
+    def _run_select(self, query):
+        where, params = query._where()
+        table = _quote(query.table)
+        count = None
+        if query.count_method:
+            count = self.conn.execute(f"select count(*) from {table}{where}", params).fetchone()[0]
+        if query.head:
+            return APIResponse([], count)
+
+        sql = f"select {query._select_list()} from {table}{where}"
+        if query.orders:
+            sql += " order by " + ", ".join(query.orders)
+        if query.limit_count is not None or query.offset_count:
+            sql += " limit ? offset ?"
+            params += [query.limit_count if query.limit_count is not None else -1, query.offset_count or 0]
+        rows = [self._decode(query.table, row) for row in self.conn.execute(sql, params)]
+        return APIResponse(rows, count)
+
+    def _insert_rows(self, query, conflict_clause):
+        rows = query.payload if isinstance(query.payload, list) else [query.payload]
+        inserted = []
+        for row in rows:
+            encoded = self._encode(query.table, row)
+            columns = list(encoded)
+            sql = (
+                f"insert into {_quote(query.table)} ({', '.join(_quote(c) for c in columns)}) "
+                f"values ({', '.join('?' for _ in columns)}){conflict_clause(columns)} returning *"
+            )
+            result = self.conn.execute(sql, [encoded[c] for c in columns]).fetchone()
+            if result is not None:
+                inserted.append(self._decode(query.table, result))
+        return APIResponse(inserted)
+
+    def _run_insert(self, query):
+        return self._insert_rows(query, lambda columns: "")
+
+    def _run_upsert(self, query):
+        target = [c.strip() for c in (query.on_conflict or "id").split(",")]
+
+        def conflict_clause(columns):
+            if not set(target) <= set(columns):
+                return ""
+            updates = [c for c in columns if c not in target]
+            if query.action == "upsert_ignore" or not updates:
+                return f" on conflict ({', '.join(_quote(c) for c in target)}) do nothing"
+            assignments = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in updates)
+            return f" on conflict ({', '.join(_quote(c) for c in target)}) do update set {assignments}"
+
+        return self._insert_rows(query, conflict_clause)
+
+    def _run_update(self, query):
+        encoded = self._encode(query.table, query.payload)
+        where, params = query._where()
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in encoded)
+        sql = f"update {_quote(query.table)} set {assignments}{where} returning *"
+        rows = self.conn.execute(sql, list(encoded.values()) + params).fetchall()
+        return APIResponse([self._decode(query.table, row) for row in rows])
+
+    def _run_delete(self, query):
+        where, params = query._where()
+        rows = self.conn.execute(f"delete from {_quote(query.table)}{where} returning *", params).fetchall()
+        return APIResponse([self._decode(query.table, row) for row in rows])
+
+    # ---------------------- Seeding ----------------------
+    def seed(self, base_dir):
+        for table, filename in SEED_FILES.items():
+            path = os.path.join(base_dir, filename)
+            if not os.path.exists(path):
+                continue
+            if self.conn.execute(f"select 1 from {_quote(table)} limit 1").fetchone():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                rows = json.load(f)
+            self.table(table).insert(rows).execute()
+
+
+def create_sqlite_client(path, seed_dir=None):
+    client = SQLiteClient(path)
+    if seed_dir:
+        client.seed(seed_dir)
+    return client
@@ -1,22 +1,116 @@
-import os
-from supabase import create_client
-
-# Try to load local .env file only if running locally
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # On Streamlit Cloud, secrets are already in env vars
-
-def init_supabase():
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-
-    if not url or not key:
-        raise ValueError(
-            "Supabase credentials not found. "
-            "Set SUPABASE_URL and SUPABASE_KEY in your .env (local) "
-            "or in Streamlit Cloud Secrets (deployment)."
-        )
-
-    return create_client(url, key)
+import os
+import threading
+import httpx
+from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
+from query_metrics import InstrumentedClient
+
+# Try to load local .env file only if running locally
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass  # On Streamlit Cloud, secrets are already in env vars
+
+# ---------------------- Connection Pool Settings ----------------------
+# Every Streamlit session and rerun shares one client per process, so the
+# pool bounds how many connections the whole app keeps open to Supabase.
+POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "20"))
+POOL_KEEPALIVE = int(os.getenv("SUPABASE_POOL_KEEPALIVE", "10"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "60"))
+REQUEST_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+POOL_TIMEOUT = float(os.getenv("SUPABASE_POOL_TIMEOUT", "5"))
+
+# ---------------------- Backend Selection ----------------------
+# "supabase" (default) talks to the hosted project; "sqlite" runs everything
+# against a local file seeded from timetable.json and users.json, for offline
+# use, benchmarks and load tests.
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+SQLITE_PATH = os.getenv("SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "class_tracker.db"))
+
+_client = None
+_client_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "connections_opened": 0, "connections_reused": 0}
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _trace_request(request):
+    # httpcore reports a TCP connect only when the pool has no idle
+    # connection to hand out; every other request rides a kept-alive one.
+    state = {"connected": False}
+
+    def trace(event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            state["connected"] = True
+            _count("connections_opened")
+        elif event_name == "http11.send_request_headers.started" or event_name == "http2.send_request_headers.started":
+            _count("requests")
+            if not state["connected"]:
+                _count("connections_reused")
+
+    request.extensions["trace"] = trace
+
+
+def _build_http_client():
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=POOL_SIZE,
+            max_keepalive_connections=min(POOL_KEEPALIVE, POOL_SIZE),
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, pool=POOL_TIMEOUT),
+        event_hooks={"request": [_trace_request]},
+    )
+
+
+def init_supabase():
+    global _client
+
+    if _client is not None:
+        return _client
+
+    if DB_BACKEND == "sqlite":
+        from sqlite_backend import create_sqlite_client
+        with _client_lock:
+            if _client is None:
+                _client = InstrumentedClient(
+                    create_sqlite_client(SQLITE_PATH, seed_dir=os.path.dirname(os.path.abspath(__file__)))
+                )
+        return _client
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+
+    if not url or not key:
+        raise ValueError(
+            "Supabase credentials not found. "
+            "Set SUPABASE_URL and SUPABASE_KEY in your .env (local) "
+            "or in Streamlit Cloud Secrets (deployment)."
+        )
+
+    with _client_lock:
+        if _client is None:
+            options = SyncClientOptions(
+                httpx_client=_build_http_client(),
+                postgrest_client_timeout=REQUEST_TIMEOUT,
+            )
+            _client = InstrumentedClient(create_client(url, key, options=options))
+    return _client
+
+
+def pool_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats.update({
+        "pool_size": POOL_SIZE,
+        "keepalive_connections": min(POOL_KEEPALIVE, POOL_SIZE),
+        "keepalive_expiry": POOL_KEEPALIVE_EXPIRY,
+        "request_timeout": REQUEST_TIMEOUT,
+        "pool_timeout": POOL_TIMEOUT,
+    })
+    return stats
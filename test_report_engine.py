@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from report_engine import SUMMARY_COLUMNS, build_status_summary, faculty_not_present
+
+USERNAME = "ABC@ldce.ac.in"
+DIVISION = "A"
+FAC_COLUMNS = ["subject", "status", "username", "division", "date", "time", "response"]
+STU_COLUMNS = ["subject", "status", "username", "division", "date", "time"]
+
+
+# The groupby / iterrows loop pages/4_monthly_report.py used before
+# report_engine; build_status_summary() must produce the same rows.
+def legacy_summary(df_fac, df_stu, username, division):
+    faculty_not_present = []
+    if not df_stu.empty:
+        grouped = df_stu.groupby(["date", "time", "subject"])
+        for (date, time, subject), group in grouped:
+            fac_match = df_fac[
+                (df_fac["date"] == date) &
+                (df_fac["time"] == time) &
+                (df_fac["subject"] == subject)
+            ]
+            if fac_match.empty or fac_match.iloc[0].get("response", "").strip().lower() == "i'm unavailable":
+                faculty_not_present.append({
+                    "subject": subject,
+                    "status": "Faculty Not Present",
+                    "username": username,
+                    "division": division,
+                    "date": date
+                })
+
+    status_records = []
+    if not df_fac.empty:
+        for _, row in df_fac.iterrows():
+            status_records.append({
+                "subject": row.get("subject", "Unknown"),
+                "status": row.get("status", "Unknown"),
+                "username": row.get("username", "N/A"),
+                "division": row.get("division", division),
+                "date": row.get("date", "")
+            })
+    status_records.extend(faculty_not_present)
+    return pd.DataFrame(status_records)
+
+
+def fac(*rows):
+    return pd.DataFrame(
+        [{"subject": s, "status": st, "username": USERNAME, "division": DIVISION, "date": d, "time": t, "response": r}
+         for s, st, d, t, r in rows],
+        columns=FAC_COLUMNS
+    )
+
+
+def stu(*rows):
+    return pd.DataFrame(
+        [{"subject": s, "status": "Faculty not present", "username": u, "division": DIVISION, "date": d, "time": t}
+         for s, u, d, t in rows],
+        columns=STU_COLUMNS
+    )
+
+
+def assert_same(df_fac, df_stu, legacy_fac=None):
+    expected = legacy_summary(df_fac if legacy_fac is None else legacy_fac, df_stu, USERNAME, DIVISION)
+    actual = build_status_summary(df_fac, df_stu, USERNAME, DIVISION)
+    assert list(actual.columns) == SUMMARY_COLUMNS
+    if expected.empty:
+        assert actual.empty
+        return
+    pd.testing.assert_frame_equal(
+        actual.reset_index(drop=True), expected[SUMMARY_COLUMNS].reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_empty_frames():
+    assert_same(fac(), stu())
+
+
+def test_only_faculty_records():
+    assert_same(fac(("DBMS", "Class Happened", "2025-08-04", "10:30-11:30", "")), stu())
+
+
+def test_only_student_reports():
+    assert_same(fac(), stu(
+        ("DBMS", "s1", "2025-08-04", "10:30-11:30"),
+        ("DBMS", "s2", "2025-08-04", "10:30-11:30"),
+        ("OS", "s1", "2025-08-05", "1:00-2:00"),
+    ))
+
+
+def test_string_responses():
+    df_fac = fac(
+        ("DBMS", "Class Happened", "2025-08-04", "10:30-11:30", ""),
+        ("OS", "Class Happened", "2025-08-05", "1:00-2:00", " I'm Unavailable "),
+        ("OS", "Cancelled", "2025-08-05", "1:00-2:00", ""),   # only the first record counts
+        ("CN", "Cancelled", "2025-08-06", "2:00-3:00", "I'm coming"),
+    )
+    df_stu = stu(
+        ("DBMS", "s1", "2025-08-04", "10:30-11:30"),
+        ("OS", "s1", "2025-08-05", "1:00-2:00"),
+        ("OS", "s2", "2025-08-05", "1:00-2:00"),
+        ("CN", "s1", "2025-08-06", "2:00-3:00"),
+        ("DS", "s3", "2025-08-07", "3:15-4:15"),
+    )
+    assert_same(df_fac, df_stu)
+    assert faculty_not_present(df_stu, df_fac)[["subject", "date"]].values.tolist() == [
+        ["OS", "2025-08-05"], ["DS", "2025-08-07"]
+    ]
+
+
+def test_nan_slot_key():
+    # groupby skips reports with a missing key; so must the anti-join.
+    df_fac = fac(("DBMS", "Class Happened", "2025-08-04", "10:30-11:30", ""))
+    df_stu = stu(
+        ("DBMS", "s1", "2025-08-04", "10:30-11:30"),
+        ("OS", "s1", "2025-08-05", np.nan),
+        ("CN", "s2", np.nan, "1:00-2:00"),
+        ("DS", "s2", "2025-08-06", "2:00-3:00"),
+    )
+    assert_same(df_fac, df_stu)
+
+
+def test_dict_responses():
+    # The old loop called .strip() on the response and failed on the
+    # {"by", "message"} form; it must be read as its message text.
+    rows = [
+        ("DBMS", "Class Happened", "2025-08-04", "10:30-11:30", {"by": USERNAME, "message": "I'm unavailable"}),
+        ("OS", "Class Happened", "2025-08-05", "1:00-2:00", {"by": USERNAME, "message": "I'm coming"}),
+        ("CN", "Cancelled", "2025-08-06", "2:00-3:00", "I'm unavailable"),
+    ]
+    as_text = [row[:4] + (row[4]["message"] if isinstance(row[4], dict) else row[4],) for row in rows]
+    df_stu = stu(
+        ("DBMS", "s1", "2025-08-04", "10:30-11:30"),
+        ("OS", "s1", "2025-08-05", "1:00-2:00"),
+        ("CN", "s2", "2025-08-06", "2:00-3:00"),
+    )
+    assert_same(fac(*rows), df_stu, legacy_fac=fac(*as_text))
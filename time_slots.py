@@ -0,0 +1,115 @@
+import heapq
+import re
+from functools import lru_cache
+
+# Timetables write afternoon hours without AM/PM ("1:00-2:00"); the college
+# day starts at 8, so an hour below that is read as PM.
+DAY_STARTS_AT = 8
+
+_TIME = re.compile(r"^\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*$", re.IGNORECASE)
+
+
+# ---------------------- Slots ----------------------
+class Slot:
+    # One per distinct label, shared by every entry that uses it.
+    __slots__ = ("start", "end", "label")
+
+    def __init__(self, start, end, label):
+        self.start = start      # minutes after midnight
+        self.end = end
+        self.label = label
+
+    def overlaps(self, other):
+        return self.start < other.end and other.start < self.end
+
+    def sort_key(self):
+        return (self.start, self.end)
+
+    def __repr__(self):
+        return f"Slot({self.label!r}, {self.start}-{self.end})"
+
+
+def _minutes(text):
+    match = _TIME.match(text)
+    if not match:
+        return None
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), (match.group(3) or "").lower()
+    if hour > 23 or minute > 59:
+        return None
+    if meridiem == "pm" and hour < 12:
+        hour += 12
+    elif meridiem == "am" and hour == 12:
+        hour = 0
+    elif not meridiem and hour < DAY_STARTS_AT:
+        hour += 12
+    return hour * 60 + minute
+
+
+@lru_cache(maxsize=1024)
+def parse_slot(label):
+    # "10:30-11:30" -> Slot(630, 690); None when the label can't be read.
+    parts = re.split(r"\s*[-–]\s*", (label or "").strip())
+    if len(parts) != 2:
+        return None
+    start, end = _minutes(parts[0]), _minutes(parts[1])
+    if start is None or end is None or end <= start:
+        return None
+    return Slot(start, end, label)
+
+
+def slot_order(label):
+    # Sort key for time labels: by start then end, unreadable labels last.
+    slot = parse_slot(label)
+    return (0,) + slot.sort_key() if slot else (1, 0, 0, label or "")
+
+
+# ---------------------- Clash Detection ----------------------
+def _sweep(intervals, conflicts):
+    # intervals: (Slot, row) in one group. Sorted once by start; a heap of
+    # running end times holds the classes still in progress, so each class
+    # is compared only with those it actually overlaps.
+    active = []
+    for order, (slot, row) in enumerate(sorted(intervals, key=lambda item: item[0].sort_key())):
+        while active and active[0][0] <= slot.start:
+            heapq.heappop(active)
+        for _, _, other in active:
+            if conflicts(other, row):
+                yield other, row
+        heapq.heappush(active, (slot.end, order, row))
+
+
+def _same_batch(a, b):
+    # A lecture (no batch) needs the whole division; labs for different
+    # batches of a division may run side by side.
+    return not a.get("batch") or not b.get("batch") or a.get("batch") == b.get("batch")
+
+
+CLASH_RULES = (
+    ("room", "room", lambda a, b: True),
+    ("faculty", "faculty", lambda a, b: True),
+    ("division", "division", _same_batch),
+)
+
+
+def find_clashes(rows):
+    # Returns (clashes, unreadable). Each clash is a dict naming the kind
+    # (room, faculty or division), the day, the shared resource and both
+    # rows. Grouping is linear and each group is sorted once: O(n log n) plus
+    # the clashes reported.
+    unreadable = [row for row in rows if parse_slot(row.get("time")) is None]
+    clashes = []
+    for kind, column, conflicts in CLASH_RULES:
+        groups = {}
+        for row in rows:
+            slot = parse_slot(row.get("time"))
+            if slot and row.get(column):
+                groups.setdefault((row.get("day"), row[column]), []).append((slot, row))
+        for (day, resource), intervals in groups.items():
+            for a, b in _sweep(intervals, conflicts):
+                clashes.append({"kind": kind, "day": day, "resource": resource, "a": a, "b": b})
+    return clashes, unreadable
+
+
+def describe(row):
+    batch = f" batch {row['batch']}" if row.get("batch") else ""
+    return f"{row.get('time')} {row.get('subject')} ({row.get('faculty')}, room {row.get('room')}, division {row.get('division')}{batch})"
@@ -0,0 +1,85 @@
+import json
+import os
+from supabase_setup import init_supabase
+from shared_cache import cached, version
+from time_slots import parse_slot, slot_order
+
+WEEK_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# How long a process keeps timetable reads. The app never writes the
+# timetable; uploads run as a separate process, so a new upload is picked up
+# when this expires.
+INDEX_TTL = float(os.getenv("TIMETABLE_INDEX_TTL", "600"))
+
+
+# ---------------------- Filtered Queries ----------------------
+def query_timetable(faculty=None, division=None, day=None, subject=None, columns="*"):
+    # Shared across sessions per filter; callers must not modify the rows.
+    def load():
+        query = init_supabase().table("timetable").select(columns)
+        if faculty:
+            query = query.eq("faculty", faculty)
+        if division:
+            query = query.eq("division", division)
+        if day:
+            query = query.eq("day", day)
+        if subject:
+            query = query.eq("subject", subject)
+        return query.execute().data or []
+    return cached("timetable", ("query", faculty, division, day, subject, columns), load, ttl=INDEX_TTL)
+
+
+# ---------------------- In-Process Index ----------------------
+class TimetableIndex:
+    def __init__(self, rows, version):
+        self.version = version
+        self.rows = rows
+        self.by_faculty_day = {}
+        self.by_division_day = {}
+        # Labels are parsed once per load; the per-day lists are kept in
+        # start-time order so pages never sort ("1:00-2:00" is after "11:30").
+        self.slots = {row.get("time"): parse_slot(row.get("time")) for row in rows}
+        for row in sorted(rows, key=lambda r: slot_order(r.get("time"))):
+            self.by_faculty_day.setdefault((row.get("faculty"), row.get("day")), []).append(row)
+            self.by_division_day.setdefault((row.get("division"), row.get("day")), []).append(row)
+
+    def slot(self, entry):
+        return self.slots.get(entry.get("time"))
+
+    def for_faculty(self, faculty, day):
+        return self.by_faculty_day.get((faculty, day), [])
+
+    def for_division(self, division, day):
+        return self.by_division_day.get((division, day), [])
+
+    def for_user(self, user, day):
+        if user["role"] == "faculty":
+            return self.for_faculty(user["username"], day)
+        elif user["role"] == "student":
+            return self.for_division(user.get("division"), day)
+        return []
+
+    def week_for_user(self, user):
+        return {day: self.for_user(user, day) for day in WEEK_DAYS}
+
+    def all_for_user(self, user):
+        return [entry for day in WEEK_DAYS for entry in self.for_user(user, day)]
+
+    def approx_bytes(self):
+        return len(json.dumps(self.rows, default=str))
+
+
+def get_timetable_index():
+    return cached("timetable", ("index",), lambda: TimetableIndex(query_timetable(), version("timetable")), ttl=INDEX_TTL)
+
+
+def get_user_classes(user, day):
+    return get_timetable_index().for_user(user, day)
+
+
+def get_user_week(user):
+    return get_timetable_index().week_for_user(user)
+
+
+def get_user_timetable(user):
+    return get_timetable_index().all_for_user(user)
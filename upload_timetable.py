@@ -1,49 +1,71 @@
-import json
-import os
-from supabase_setup import init_supabase
-
-supabase = init_supabase()
-
-# ---------------------- Load JSON ----------------------
-TIMETABLE_FILE = "timetable.json"
-
-if not os.path.exists(TIMETABLE_FILE):
-    print("timetable.json not found.")
-    exit()
-
-with open(TIMETABLE_FILE, "r", encoding="utf-8") as f:
-    data = json.load(f)
-
-# ---------------------- Upload Data ----------------------
-success_count = 0
-fail_count = 0
-
-for row in data:
-    try:
-        payload = {
-            "day": row.get("day", ""),
-            "time": row.get("time", ""),
-            "subject": row.get("subject", ""),
-            "faculty": row.get("faculty", ""),
-            "division": row.get("division", ""),
-            "batch": row.get("batch"),  # Can be None
-            "room": row.get("room", ""),
-            "type": row.get("type", "")
-        }
-
-        response = supabase.table("timetable").insert(payload, upsert=True).execute()
-
-        if response.data:
-            success_count += 1
-        else:
-            print("⚠️ Failed insert:", payload)
-            fail_count += 1
-    except Exception as e:
-        print("Error inserting row:", row)
-        print("Exception:", e)
-        fail_count += 1
-
-# ---------------------- Summary ----------------------
-print("\nUpload completed:")
-print(f"  Inserted/Updated: {success_count}")
-print(f"  Failed          : {fail_count}")
+import argparse
+import json
+import os
+from bulk_sync import DEFAULT_CHUNK_SIZE, print_summary, sync_table
+from time_slots import describe, find_clashes
+
+TIMETABLE_KEY = ("day", "time", "division", "batch", "subject")
+
+# ---------------------- Arguments ----------------------
+parser = argparse.ArgumentParser(description="Sync timetable.json into the timetable table.")
+parser.add_argument("--file", default="timetable.json")
+parser.add_argument("--dry-run", action="store_true", help="Show the inserts, updates and deletes without writing.")
+parser.add_argument("--keep-missing", action="store_true", help="Do not delete stored rows that are absent from the file.")
+parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+parser.add_argument("--verbose", action="store_true", help="List every changed row.")
+parser.add_argument("--allow-clashes", action="store_true", help="Upload even if a room, faculty member or division is double-booked.")
+args = parser.parse_args()
+
+# ---------------------- Load JSON ----------------------
+TIMETABLE_FILE = args.file
+
+if not os.path.exists(TIMETABLE_FILE):
+    print(f"{TIMETABLE_FILE} not found.")
+    exit()
+
+with open(TIMETABLE_FILE, "r", encoding="utf-8") as f:
+    data = json.load(f)
+
+rows = [
+    {
+        "day": row.get("day", ""),
+        "time": row.get("time", ""),
+        "subject": row.get("subject", ""),
+        "faculty": row.get("faculty", ""),
+        "division": row.get("division", ""),
+        "batch": row.get("batch"),  # Can be None
+        "room": row.get("room", ""),
+        "type": row.get("type", "")
+    }
+    for row in data
+]
+
+# ---------------------- Check Clashes ----------------------
+clashes, unreadable = find_clashes(rows)
+for row in unreadable:
+    print(f"Unreadable time '{row['time']}' on {row['day']}: {describe(row)}")
+for clash in clashes:
+    print(f"{clash['kind'].capitalize()} clash on {clash['day']} ({clash['resource']}):")
+    print(f"  {describe(clash['a'])}")
+    print(f"  {describe(clash['b'])}")
+if (clashes or unreadable) and not args.allow_clashes:
+    print(f"{len(clashes)} clash(es), {len(unreadable)} unreadable time(s). Nothing was written; fix the file or pass --allow-clashes.")
+    exit(1)
+
+# ---------------------- Sync Data ----------------------
+try:
+    summary = sync_table(
+        "timetable",
+        rows,
+        TIMETABLE_KEY,
+        chunk_size=args.chunk_size,
+        dry_run=args.dry_run,
+        prune=not args.keep_missing
+    )
+except Exception as e:
+    print("Sync failed:", e)
+    print("Re-run the same command to apply the remaining changes.")
+    exit(1)
+
+# ---------------------- Summary ----------------------
+print_summary(summary, verbose=args.verbose)
@@ -1,14 +1,27 @@
-import json
-from supabase_setup import init_supabase
-
-supabase = init_supabase()
-
-# Load users.json
-with open("users.json", "r") as f:
-    users = json.load(f)
-
-# Upsert each user (insert or update)
-for user in users:
-    supabase.table("users").upsert(user).execute()
-
-print("All users upserted successfully.")
+import argparse
+import json
+from bulk_sync import DEFAULT_CHUNK_SIZE, print_summary, sync_table
+
+parser = argparse.ArgumentParser(description="Sync users.json into the users table.")
+parser.add_argument("--file", default="users.json")
+parser.add_argument("--dry-run", action="store_true", help="Show the inserts and updates without writing.")
+parser.add_argument("--prune", action="store_true", help="Also delete stored users that are absent from the file.")
+parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+parser.add_argument("--verbose", action="store_true", help="List every changed user.")
+args = parser.parse_args()
+
+# Load users.json
+with open(args.file, "r") as f:
+    users = json.load(f)
+
+# Insert new users and update changed ones in chunked bulk requests
+summary = sync_table(
+    "users",
+    users,
+    ("username",),
+    chunk_size=args.chunk_size,
+    dry_run=args.dry_run,
+    prune=args.prune
+)
+
+print_summary(summary, verbose=args.verbose)
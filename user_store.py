@@ -0,0 +1,169 @@
+import io
+import re
+import pandas as pd
+from supabase_setup import init_supabase
+from bulk_sync import DEFAULT_CHUNK_SIZE, chunked, diff_rows, scan_table
+from auth import invalidate_users
+from shared_cache import bump, cached
+
+FACULTY_COLUMNS = "username, subjects, divisions"
+FACULTY_PAGE_SIZE = 20
+IMPORT_COLUMNS = ["username", "password", "subjects", "divisions"]
+
+_USERNAME = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def parse_list(value):
+    # "DBMS, OS" (or "DBMS; OS" from spreadsheets) -> ["DBMS", "OS"]
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    return [part.strip() for part in re.split(r"[,;]", str(value)) if part.strip()]
+
+
+# ---------------------- Search ----------------------
+def search_faculty(search="", page=0, page_size=FACULTY_PAGE_SIZE):
+    # One page of faculty plus the total match count, filtered and sliced by
+    # the database; passwords are never read.
+    search = search.strip().replace("%", "").replace("*", "")
+
+    def load():
+        query = init_supabase().table("users").select(FACULTY_COLUMNS, count="exact").eq("role", "faculty")
+        if search:
+            query = query.ilike("username", f"%{search}%")
+        result = query.order("username").range(page * page_size, (page + 1) * page_size - 1).execute()
+        return result.data or [], result.count or 0
+    return cached("users", ("faculty_search", search, page, page_size), load)
+
+
+def reload_users():
+    # For edits made outside the app (SQL editor, upload_users.py).
+    invalidate_users()
+    bump("users")
+
+
+def faculty_csv():
+    # Round-trip template for bulk edits: the password column is left blank,
+    # which the import reads as "keep the current password".
+    rows = scan_table("users", "id, " + FACULTY_COLUMNS, lambda q: q.eq("role", "faculty"))
+    frame = pd.DataFrame(
+        [[r["username"], "", ", ".join(r.get("subjects") or []), ", ".join(r.get("divisions") or [])] for r in rows],
+        columns=IMPORT_COLUMNS
+    )
+    return frame.sort_values("username").to_csv(index=False).encode("utf-8")
+
+
+# ---------------------- Single Edits ----------------------
+def update_faculty(username, subjects, divisions, password=None):
+    changes = {"subjects": parse_list(subjects), "divisions": parse_list(divisions)}
+    if password:
+        changes["password"] = password
+    init_supabase().table("users").update(changes).eq("username", username).execute()
+    invalidate_users(username)
+    bump("users")
+
+
+def delete_faculty(username):
+    init_supabase().table("users").delete().eq("username", username).eq("role", "faculty").execute()
+    invalidate_users(username)
+    bump("users")
+
+
+def create_faculty(username, password, subjects, divisions):
+    username = username.strip()
+    if not _USERNAME.match(username):
+        raise ValueError("Please enter the faculty member's email as the username.")
+    if not password:
+        raise ValueError("Please enter a password.")
+    exists = init_supabase().table("users").select("username").eq("username", username).limit(1).execute()
+    if exists.data:
+        raise ValueError("A user with this username already exists.")
+    init_supabase().table("users").insert({
+        "username": username,
+        "password": password,
+        "role": "faculty",
+        "subjects": parse_list(subjects),
+        "divisions": parse_list(divisions),
+    }).execute()
+    bump("users")
+
+
+# ---------------------- Bulk Import ----------------------
+def read_import(name, data):
+    if name.lower().endswith((".xlsx", ".xls")):
+        try:
+            import openpyxl  # noqa: F401 (pandas' Excel reader)
+        except ImportError:
+            raise ValueError("Excel import needs the optional 'openpyxl' package; upload a CSV instead.")
+        frame = pd.read_excel(io.BytesIO(data), dtype=str)
+    else:
+        frame = pd.read_csv(io.BytesIO(data), dtype=str)
+    frame.columns = [str(c).strip().lower() for c in frame.columns]
+    return frame
+
+
+def _stored_users(usernames):
+    client = init_supabase()
+    stored = {}
+    for chunk in chunked(sorted(usernames), DEFAULT_CHUNK_SIZE):
+        rows = client.table("users").select("id, username, password, role, subjects, divisions") \
+            .in_("username", chunk).execute().data or []
+        stored.update((row["username"], row) for row in rows)
+    return stored
+
+
+def plan_import(frame):
+    # Validates every row and diffs the valid ones against the stored users.
+    # Nothing is written; apply_import() takes the returned plan.
+    plan = {"rows": [], "inserted": [], "updated": [], "unchanged": 0, "errors": []}
+    if "username" not in frame.columns:
+        plan["errors"].append((1, "The file needs a 'username' column."))
+        return plan
+    unknown = [c for c in frame.columns if c not in IMPORT_COLUMNS]
+    if unknown:
+        plan["errors"].append((1, f"Unknown columns: {', '.join(unknown)} (expected {', '.join(IMPORT_COLUMNS)})."))
+        return plan
+
+    records = frame.astype(object).where(frame.notna(), None).to_dict("records")
+    stored = _stored_users({(r["username"] or "").strip() for r in records if r.get("username")})
+
+    desired, seen = [], set()
+    for line, record in enumerate(records, start=2):  # line 1 is the header
+        username = (record.get("username") or "").strip()
+        password = record.get("password") or ""
+        current = stored.get(username)
+        if not _USERNAME.match(username):
+            plan["errors"].append((line, f"'{username}' is not an email username."))
+        elif username in seen:
+            plan["errors"].append((line, f"{username} appears more than once."))
+        elif current and current.get("role") != "faculty":
+            plan["errors"].append((line, f"{username} already exists as a {current.get('role')} user."))
+        elif not current and not password.strip():
+            plan["errors"].append((line, f"{username} is new and needs a password."))
+        else:
+            row = {"username": username, "role": "faculty", "password": password if password.strip() else current["password"]}
+            for column in ("subjects", "divisions"):
+                row[column] = parse_list(record.get(column)) if column in frame.columns else (current or {}).get(column) or []
+            desired.append(row)
+        seen.add(username)
+
+    inserts, updates, _, _ = diff_rows(stored.values(), desired, ("username",))
+    plan["rows"] = inserts + [{k: v for k, v in row.items() if k != "id"} for row in updates]
+    plan["inserted"] = [row["username"] for row in inserts]
+    plan["updated"] = [row["username"] for row in updates]
+    plan["unchanged"] = len(desired) - len(plan["rows"])
+    return plan
+
+
+def apply_import(plan, chunk_size=DEFAULT_CHUNK_SIZE):
+    # New and changed faculty go in one upsert on username per chunk.
+    client = init_supabase()
+    requests = 0
+    for chunk in chunked(plan["rows"], chunk_size):
+        client.table("users").upsert(chunk, on_conflict="username").execute()
+        requests += 1
+    for username in plan["updated"]:
+        invalidate_users(username)
+    bump("users")
+    return requests